@@ -0,0 +1,108 @@
+#!/usr/bin/env python3
+"""
+asyncio (aiohttp) variant of the mock admin demo server
+
+Serves the same routes as demo_admin_server.py from a single event loop,
+without a thread per request or per-request access logging.
+"""
+from aiohttp import web
+
+from demo_admin_server import (
+    _ADMIN_MM,
+    _ADMIN_HTML_GZ,
+    _COMPANIES,
+    _dumps,
+    _loads,
+)
+
+routes = web.RouteTableDef()
+
+# Serialized /api/admin/companies response; reset whenever a company is added
+_COMPANIES_JSON_CACHE = None
+
+_ADMIN_BODY = memoryview(_ADMIN_MM)
+_CORS_HEADERS = {'Access-Control-Allow-Origin': '*'}
+
+
+def _json_response(obj):
+    """Build a JSON response from pre-encoded bytes"""
+    body = obj if isinstance(obj, bytes) else _dumps(obj)
+    return web.Response(body=body, content_type='application/json', headers=_CORS_HEADERS)
+
+
+@routes.get('/admin')
+async def admin(request):
+    """Serve the admin page with mock data"""
+    headers = {'Vary': 'Accept-Encoding'}
+    if 'gzip' in request.headers.get('Accept-Encoding', ''):
+        headers['Content-Encoding'] = 'gzip'
+        body = _ADMIN_HTML_GZ
+    else:
+        body = _ADMIN_BODY
+    return web.Response(body=body, content_type='text/html', charset='utf-8', headers=headers)
+
+
+@routes.get('/api/admin/companies')
+async def companies_api(request):
+    """Serve mock companies API"""
+    global _COMPANIES_JSON_CACHE
+    if _COMPANIES_JSON_CACHE is None:
+        _COMPANIES_JSON_CACHE = _dumps({
+            'success': True,
+            'companies': _COMPANIES
+        })
+    return _json_response(_COMPANIES_JSON_CACHE)
+
+
+@routes.post('/api/admin/add-company')
+async def add_company(request):
+    """Handle add company request"""
+    global _COMPANIES_JSON_CACHE
+    raw = await request.read()
+    data = _loads(raw) if raw else {}
+
+    try:
+        symbol = data['symbol'].upper()
+        _COMPANIES[symbol] = {
+            'name': data['name'],
+            'cik': data['cik']
+        }
+        _COMPANIES_JSON_CACHE = None
+        success = True
+    except Exception:
+        success = False
+
+    return _json_response({
+        'success': success,
+        'message': f"Company {data['symbol']} added successfully (Demo)"
+    })
+
+
+@routes.post('/api/admin/add-years')
+async def add_years(request):
+    """Handle add years request"""
+    raw = await request.read()
+    data = _loads(raw) if raw else {}
+
+    nc = len(data['companies'])
+    files = nc * len(data['years'])
+    return _json_response({
+        'success': True,
+        'message': f"Successfully processed demo files for {nc} companies",
+        'processed_files': files,
+        'total_chunks': files * 50  # Mock chunks
+    })
+
+
+def create_app():
+    """Build the aiohttp application"""
+    app = web.Application()
+    app.add_routes(routes)
+    return app
+
+
+if __name__ == '__main__':
+    port = 8080
+    print(f"🚀 Mock Admin Demo Server (asyncio) running at http://localhost:{port}/admin")
+    print("\n🛑 Press Ctrl+C to stop")
+    web.run_app(create_app(), host='localhost', port=port, access_log=None, print=None)
@@ -13,54 +13,96 @@ Supports two main modes:
 import os
 import sys
 import argparse
+import functools
 import logging
 import json
+import socket
+import threading
+from urllib.parse import urlparse
+from collections import Counter
 from datetime import datetime
-from pathlib import Path
+from pathlib import Path, PurePath
+
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
 
 # Add src to path for imports
 sys.path.insert(0, str(Path(__file__).parent / "src"))
 
-try:
-    from src.rag.azure_rag_pipeline import AzureRAGPipeline
-    AZURE_RAG_AVAILABLE = True
-except ImportError as e:
-    print(f"Azure RAG pipeline not available: {e}")
-    AZURE_RAG_AVAILABLE = False
 
-try:
-    from src.scrapers.sec_edgar_scraper import SECEdgarScraper
-    SCRAPER_AVAILABLE = True
-except ImportError as e:
-    print(f"SEC scraper not available: {e}")
-    SCRAPER_AVAILABLE = False
+def setup_logging(level=logging.INFO, timestamps=False):
+    """Setup logging configuration."""
+    # Skip thread/process lookups that no format string here uses
+    logging.logThreads = False
+    logging.logProcesses = False
+    logging.logMultiprocessing = False
+    
+    # Only format timestamps on request; strftime per record adds up during bulk runs
+    log_format = '%(asctime)s - %(levelname)s - %(message)s' if timestamps else '%(levelname)s - %(message)s'
+    # Records go straight to stdout so download and ingestion progress shows as it happens
+    logging.basicConfig(level=level, format=log_format, stream=sys.stdout)
 
 
-def setup_logging(level=logging.INFO):
-    """Setup logging configuration."""
-    logging.basicConfig(
-        level=level,
-        format='%(asctime)s - %(levelname)s - %(message)s',
-        handlers=[
-            logging.StreamHandler(sys.stdout)
-        ]
-    )
+# Past interactive questions, one per line; the most frequent are prefetched at startup
+QUERY_HISTORY_PATH = Path.home() / ".azure_rag_query_history"
+
+
+def load_popular_queries(limit=10):
+    """Return the most frequently asked past questions."""
+    try:
+        with open(QUERY_HISTORY_PATH, encoding='utf-8') as f:
+            counts = Counter(line.strip() for line in f if line.strip())
+    except OSError:
+        return []
+    return [query for query, _ in counts.most_common(limit)]
+
+
+def record_query(query):
+    """Append a question to the interactive query history."""
+    try:
+        with open(QUERY_HISTORY_PATH, 'a', encoding='utf-8') as f:
+            f.write(query.replace('\n', ' ') + '\n')
+    except OSError:
+        pass
+
+
+def write_json(obj):
+    """Write obj to stdout as indented JSON."""
+    if ORJSON_AVAILABLE:
+        # Flush pending print() output so it stays ahead of the raw bytes
+        sys.stdout.flush()
+        sys.stdout.buffer.write(orjson.dumps(
+            obj, option=orjson.OPT_INDENT_2 | orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_APPEND_NEWLINE
+        ))
+        sys.stdout.buffer.flush()
+    else:
+        print(json.dumps(obj, indent=2))
 
 
 def run_scraper_mode(args):
     """Run the SEC filing scraper."""
-    if not SCRAPER_AVAILABLE:
+    try:
+        from src.scrapers.sec_edgar_scraper import SECEdgarScraper, ASYNC_SCRAPER_AVAILABLE
+    except ImportError as e:
+        print(f"SEC scraper not available: {e}")
         print("❌ SEC scraper not available. Please check your installation.")
         sys.exit(1)
     
-    print("Azure RAG Financial System - SEC EDGAR Scraper")
-    print("=" * 50)
-    print(f"Companies: {', '.join(args.companies)}")
-    print(f"Years: {', '.join(map(str, args.years))}")
-    print(f"Output directory: {args.output_dir}")
-    print(f"Expected total files: {len(args.companies) * len(args.years)}")
-    print("=" * 50)
-    print()
+    expected_total = len(args.companies) * len(args.years)
+    years_str = ', '.join(map(str, args.years))
+    companies_str = ', '.join(args.companies)
+    sys.stdout.write(
+        "Azure RAG Financial System - SEC EDGAR Scraper\n"
+        f"{'=' * 50}\n"
+        f"Companies: {companies_str}\n"
+        f"Years: {years_str}\n"
+        f"Output directory: {args.output_dir}\n"
+        f"Expected total files: {expected_total}\n"
+        f"{'=' * 50}\n\n"
+    )
     
     # Create scraper instance
     scraper = SECEdgarScraper(
@@ -71,39 +113,42 @@ def run_scraper_mode(args):
     # Create output directory
     os.makedirs(args.output_dir, exist_ok=True)
     
-    # Track results
-    all_results = {}
-    total_downloaded = 0
-    
     try:
-        # Download filings for each company
-        for company in args.companies:
-            print(f"\nProcessing {company}...")
-            files = scraper.scrape_company_10k_filings(company, args.years, args.output_dir)
-            all_results[company] = files
-            total_downloaded += len(files)
+        if ASYNC_SCRAPER_AVAILABLE:
+            import asyncio
+            # Download all companies concurrently under a shared 10 req/s limit
+            print(f"\nProcessing {companies_str} concurrently...")
+            all_results = asyncio.run(
+                scraper.scrape_all_companies_async(args.companies, args.years, args.output_dir)
+            )
+        else:
+            all_results = {}
+            for company in args.companies:
+                print(f"\nProcessing {company}...")
+                all_results[company] = scraper.scrape_company_10k_filings(
+                    company, args.years, args.output_dir
+                )
+        total_downloaded = sum(len(files) for files in all_results.values())
             
-        # Print summary
-        print("\n" + "=" * 60)
-        print("DOWNLOAD SUMMARY")
-        print("=" * 60)
+        # Print summary in a single write
+        lines = ["", "=" * 60, "DOWNLOAD SUMMARY", "=" * 60]
         
         for company, files in all_results.items():
-            print(f"\n{company}:")
-            print(f"  Files downloaded: {len(files)}")
+            lines.append(f"\n{company}:")
+            lines.append(f"  Files downloaded: {len(files)}")
             
-            for file_path in files:
-                filename = os.path.basename(file_path)
-                file_size = os.path.getsize(file_path) if os.path.exists(file_path) else 0
-                print(f"    - {filename} ({file_size:,} bytes)")
+            for file_path, file_size in files:
+                lines.append(f"    - {PurePath(file_path).name} ({file_size:,} bytes)")
         
-        print(f"\nTotal files downloaded: {total_downloaded}")
-        print(f"Expected files: {len(args.companies) * len(args.years)}")
+        lines.append(f"\nTotal files downloaded: {total_downloaded}")
+        lines.append(f"Expected files: {expected_total}")
         
-        if total_downloaded == len(args.companies) * len(args.years):
-            print("✅ All expected files downloaded successfully!")
+        if total_downloaded == expected_total:
+            lines.append("✅ All expected files downloaded successfully!")
         else:
-            print("⚠️  Some files may be missing. Check the logs above for details.")
+            lines.append("⚠️  Some files may be missing. Check the logs above for details.")
+        
+        sys.stdout.write("\n".join(lines) + "\n")
             
     except KeyboardInterrupt:
         print("\n\nDownload interrupted by user.")
@@ -111,11 +156,16 @@ def run_scraper_mode(args):
     except Exception as e:
         print(f"\nError during download: {e}")
         sys.exit(1)
+    finally:
+        scraper.close()
 
 
 def run_rag_mode(args):
     """Run the Azure RAG pipeline."""
-    if not AZURE_RAG_AVAILABLE:
+    try:
+        from src.rag.azure_rag_pipeline import AzureRAGPipeline, find_html_files
+    except ImportError as e:
+        print(f"Azure RAG pipeline not available: {e}")
         print("❌ Azure RAG pipeline not available. Please check your Azure configuration.")
         sys.exit(1)
     
@@ -134,20 +184,41 @@ def run_rag_mode(args):
             search_index_name=args.search_index,
             openai_endpoint=args.openai_endpoint,
             openai_deployment=args.openai_deployment,
-            embedding_deployment=args.embedding_deployment
+            embedding_deployment=args.embedding_deployment,
+            quantization=args.quantization,
+            chunk_strategy=args.chunk_strategy,
+            compress_uploads=args.gzip_uploads
         )
         print("🚀 Azure RAG Pipeline initialized successfully")
         
         if args.process:
             # Process documents
             print("Processing documents...")
-            results = rag.process_directory(args.input_dir)
+            try:
+                files = find_html_files(args.input_dir)
+            except OSError:
+                print(f"❌ Directory {args.input_dir} does not exist")
+                sys.exit(1)
+            if not files:
+                print(f"❌ No HTML files found in {args.input_dir}")
+                sys.exit(1)
+            
+            results = rag.process_files(
+                files,
+                parse_workers=args.max_workers,
+                progress_callback=lambda stats: print(
+                    f"  Uploaded {stats['search_documents']} documents "
+                    f"({stats['processed_files']}/{stats['total_files']} files parsed)"
+                )
+            )
             
             print("\n" + "=" * 50)
             print("PROCESSING SUMMARY")
             print("=" * 50)
             print(f"Files processed: {results['processed_files']}/{results['total_files']}")
             print(f"Total chunks created: {results['total_chunks']}")
+            if results.get('failed_chunks'):
+                print(f"⚠️  Chunks dropped after failed embedding requests: {results['failed_chunks']}")
             print(f"Azure Search documents: {results['search_documents']}")
             print("✅ Documents processed successfully!")
             print()
@@ -162,11 +233,11 @@ def run_rag_mode(args):
             print(f"Query: {args.query}")
             print("=" * 60)
             
-            result = rag.query(args.query, top_k=args.top_k, return_json=True)
+            result = rag.query(args.query, top_k=args.top_k, return_format='dict')
             
             print("\n📋 Azure RAG Query Result:")
             print("=" * 40)
-            print(json.dumps(result, indent=2))
+            write_json(result)
                 
         elif not args.process:
             # Interactive query mode
@@ -175,6 +246,17 @@ def run_rag_mode(args):
             print("Type 'quit' or 'exit' to stop.")
             print()
             
+            def warm_embeddings():
+                # Reopen the embedding connection while the user is typing
+                threading.Thread(target=rag.embedding_service.warmup, daemon=True).start()
+            
+            def prefetch():
+                # Open both Azure connections, then embed frequent past questions
+                rag.warmup()
+                rag.prefetch_queries(load_popular_queries())
+            
+            # Runs while the first question is being typed
+            threading.Thread(target=prefetch, daemon=True).start()
             while True:
                 try:
                     query = input("💬 Your question: ").strip()
@@ -186,23 +268,29 @@ def run_rag_mode(args):
                     if not query:
                         continue
                     
+                    record_query(query)
                     print(f"\n🔍 Searching with Azure AI: {query}")
                     print("-" * 50)
                     
-                    result = rag.query(query, top_k=args.top_k, return_json=True)
+                    result = rag.query(query, top_k=args.top_k, return_format='stream')
                     
                     if 'error' in result:
                         print(f"❌ Error: {result['error']}")
                         continue
                     
-                    print(f"📊 Answer: {result.get('answer', 'No answer generated')}")
+                    # Print the answer as it is generated
+                    print("📊 Answer: ", end='', flush=True)
+                    for delta in result['answer']:
+                        print(delta, end='', flush=True)
+                    print()
                     print(f"🎯 Confidence: {result.get('confidence', 0.0):.2f}")
                     print(f"📚 Sources: {len(result.get('sources', []))}")
                     
                     print("-" * 50)
                     print()
+                    warm_embeddings()
                     
-                except KeyboardInterrupt:
+                except (KeyboardInterrupt, EOFError):
                     print("\n\n👋 Goodbye!")
                     break
                 except Exception as e:
@@ -218,8 +306,26 @@ def run_rag_mode(args):
         sys.exit(1)
 
 
-def main():
-    """Main entry point with argument parsing."""
+def _warm_dns(args):
+    """Resolve the hosts the selected mode will contact, ahead of the first request."""
+    if args.mode == 'scrape':
+        hosts = ['www.sec.gov', 'data.sec.gov']
+    else:
+        hosts = []
+        if args.search_service:
+            hosts.append(f"{args.search_service}.search.windows.net")
+        if args.openai_endpoint:
+            hosts.append(urlparse(args.openai_endpoint).hostname)
+    for host in hosts:
+        try:
+            socket.getaddrinfo(host, 443, type=socket.SOCK_STREAM)
+        except (OSError, UnicodeError):
+            pass
+
+
+@functools.cache
+def _build_parser():
+    """Build the CLI argument parser (once per process)."""
     parser = argparse.ArgumentParser(
         description='Azure RAG Financial System',
         formatter_class=argparse.RawDescriptionHelpFormatter,
@@ -236,6 +342,15 @@ Examples:
   
   # Interactive query mode
   python main.py rag
+
+Chunk strategies (--chunk-strategy):
+  regex-dfa  single-pass split on paragraph/line/sentence/word separators,
+             packed greedily up to the token limit (default)
+  recursive  section-aware: SECTION_ headers, financial tables, then
+             paragraphs and sentences up to the token limit
+  semantic   semchunk's semantic splitter (pip install semchunk)
+The Python API and the web app default to recursive; only this CLI
+defaults to regex-dfa.
         """
     )
     
@@ -244,6 +359,7 @@ Examples:
     
     # Scraper mode
     scraper_parser = subparsers.add_parser('scrape', help='Download SEC filings')
+    scraper_parser.set_defaults(func=run_scraper_mode)
     scraper_parser.add_argument('--companies', nargs='+', default=['GOOGL', 'MSFT', 'NVDA'],
                                choices=['GOOGL', 'MSFT', 'NVDA'],
                                help='Company symbols to download (default: all)')
@@ -259,6 +375,7 @@ Examples:
     
     # RAG mode
     rag_parser = subparsers.add_parser('rag', help='Azure RAG pipeline operations')
+    rag_parser.set_defaults(func=run_rag_mode)
     rag_parser.add_argument('--input-dir', default='demo_filings',
                            help='Directory containing HTML filings (default: demo_filings)')
     rag_parser.add_argument('--search-service', 
@@ -273,6 +390,15 @@ Examples:
                            help='Azure OpenAI deployment name (default: gpt-4)')
     rag_parser.add_argument('--embedding-deployment', default='text-embedding-ada-002',
                            help='Azure OpenAI embedding deployment name')
+    rag_parser.add_argument('--quantization', choices=['none', 'scalar', 'binary'], default='none',
+                           help='Vector compression for the search index (default: none)')
+    rag_parser.add_argument('--max-workers', type=int, default=os.cpu_count(),
+                           help='Processes used to parse filings with --process (default: CPU count)')
+    rag_parser.add_argument('--chunk-strategy', choices=['regex-dfa', 'recursive', 'semantic'],
+                           default='regex-dfa',
+                           help='How filings are split into chunks with --process (default: regex-dfa)')
+    rag_parser.add_argument('--gzip-uploads', action='store_true',
+                           help='Gzip-compress document uploads to Azure AI Search')
     rag_parser.add_argument('--process', action='store_true',
                            help='Process documents and build Azure search index')
     rag_parser.add_argument('--query', type=str,
@@ -283,7 +409,22 @@ Examples:
     # Global options
     parser.add_argument('--verbose', '-v', action='store_true',
                        help='Enable verbose logging')
+    parser.add_argument('--timestamps', action='store_true',
+                       help='Prefix log lines with timestamps')
     
+    return parser
+
+
+def main():
+    """Main entry point with argument parsing."""
+    # The pipeline module is imported lazily, so load .env here for the CLI defaults
+    try:
+        from dotenv import load_dotenv
+        load_dotenv()
+    except ImportError:
+        pass
+    
+    parser = _build_parser()
     args = parser.parse_args()
     
     # If no mode specified, show help
@@ -291,18 +432,15 @@ Examples:
         parser.print_help()
         sys.exit(1)
     
+    # Resolve endpoint hosts while logging and clients are being set up
+    threading.Thread(target=_warm_dns, args=(args,), daemon=True).start()
+    
     # Setup logging
     log_level = logging.DEBUG if args.verbose else logging.INFO
-    setup_logging(log_level)
+    setup_logging(log_level, timestamps=args.timestamps)
     
     # Route to appropriate mode
-    if args.mode == 'scrape':
-        run_scraper_mode(args)
-    elif args.mode == 'rag':
-        run_rag_mode(args)
-    else:
-        parser.print_help()
-        sys.exit(1)
+    args.func(args)
 
 
 if __name__ == "__main__":
@@ -0,0 +1,20 @@
+#!/usr/bin/env python3
+"""
+Ahead-of-time compile the admin demo server with mypyc
+
+Usage:
+    pip install mypy setuptools
+    python setup_mypyc.py build_ext --inplace
+
+The resulting extension module shadows demo_admin_server.py on import; start
+the compiled server with:
+    python -c "import demo_admin_server; demo_admin_server.main()"
+"""
+from setuptools import setup
+from mypyc.build import mypycify
+
+setup(
+    name='demo-admin-server',
+    # src/ is put on sys.path at runtime, so mypy can't resolve the scraper import
+    ext_modules=mypycify(['--ignore-missing-imports', 'demo_admin_server.py']),
+)
@@ -15,13 +15,24 @@ Key features:
 import os
 import logging
 import json
-from typing import List, Dict, Any, Optional
+import gzip
+import hashlib
+import sqlite3
+import queue
+import threading
+from bisect import bisect_right
+from functools import lru_cache
+from collections.abc import Sequence
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor, as_completed
+from dataclasses import dataclass, field
+from functools import partial
+from itertools import accumulate, chain
+from typing import List, Dict, Any, Optional, Tuple
 from pathlib import Path
-import asyncio
 from datetime import datetime, timezone
 
 # Azure imports
-from azure.search.documents import SearchClient
+from azure.search.documents import SearchClient, SearchIndexingBufferedSender
 from azure.search.documents.indexes import SearchIndexClient
 from azure.search.documents.indexes.models import (
     SearchIndex,
@@ -32,19 +43,36 @@ from azure.search.documents.indexes.models import (
     VectorSearch,
     VectorSearchProfile,
     HnswAlgorithmConfiguration,
+    ScalarQuantizationCompression,
+    ScalarQuantizationParameters,
+    BinaryQuantizationCompression,
+    RescoringOptions,
+    SemanticConfiguration,
+    SemanticField,
+    SemanticPrioritizedFields,
+    SemanticSearch,
 )
 from azure.core.credentials import AzureKeyCredential
 from azure.identity import DefaultAzureCredential
 
 # OpenAI imports
 from openai import AzureOpenAI
+import httpx
 
 # Document processing
 import tiktoken
-from bs4 import BeautifulSoup
+from lxml import etree
+import numpy as np
 import pandas as pd
 import re
 
+# Semantic chunking (optional)
+try:
+    import semchunk
+    SEMCHUNK_AVAILABLE = True
+except ImportError:
+    SEMCHUNK_AVAILABLE = False
+
 # Configuration
 from dotenv import load_dotenv
 
@@ -53,6 +81,205 @@ load_dotenv()
 
 logger = logging.getLogger(__name__)
 
+# Fast JSON serialization for query results (optional)
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+# HTTP/2 for the Azure OpenAI connection pool needs the optional h2 package
+try:
+    import h2  # noqa: F401
+    _HTTP2_AVAILABLE = True
+except ImportError:
+    _HTTP2_AVAILABLE = False
+
+# libxml2 HTML parsers. The plain etree parser skips lxml.html's per-element Python
+# class lookup, and extraction only needs the base element API. Documents are read as
+# UTF-8 unless they declare a charset in a <meta> tag within the first 1024 bytes (the
+# HTML prescan window), which libxml2 then honors itself
+_HTML_PARSER = etree.HTMLParser(encoding='utf-8')
+_DECLARED_CHARSET_HTML_PARSER = etree.HTMLParser()
+_META_CHARSET_RE = re.compile(rb'<meta[^>]+charset\s*=', re.IGNORECASE)
+_TEXT_NODES = etree.XPath('.//text()')
+
+# Subtrees removed before extraction: scripts, styles, fallback and template markup, and
+# the hidden inline-XBRL header of iXBRL filings (contexts, units and hidden facts)
+_SKIPPED_TAGS = ('script', 'style', 'noscript', 'template', 'ix:header')
+
+# Block elements visited by extract_text_from_html, grouped for O(1) dispatch
+_HEADER_TAGS = frozenset({'h1', 'h2', 'h3', 'h4'})
+_PARAGRAPH_TAGS = frozenset({'p', 'div'})
+_BLOCK_TAGS = tuple(_HEADER_TAGS | _PARAGRAPH_TAGS | {'table', 'ul', 'ol'})
+
+# Chunking strategies understood by DocumentProcessor.process_file
+CHUNK_STRATEGIES = ('regex-dfa', 'recursive', 'semantic')
+
+# Library and web app default; `main.py rag --chunk-strategy` defaults to regex-dfa instead
+DEFAULT_CHUNK_STRATEGY = 'recursive'
+
+# No strategy overlaps chunks any more; other values are accepted but ignored
+_DEFAULT_CHUNK_OVERLAP = 200
+
+# Filing filenames as written by the scraper, e.g. "GOOGL_10K_2023_0001652044-23-000016.htm"
+_FILENAME_RE = re.compile(r'^(?P<company>[^_]+)_(?P<filing_type>10[KQ]|8K)_(?P<year>\d{4})[_.]')
+
+# Separators for the regex-dfa strategy, matched in a single pass over the text
+_SEP_RE = re.compile(r'(\n\n|\n|\. |, | )')
+
+# Table blocks marked by extract_text_from_html, and the sentence boundaries used to
+# split paragraphs that exceed the chunk size (structured chunking)
+_TABLE_RE = re.compile(r'\[FINANCIAL_TABLE\](.*?)\[/FINANCIAL_TABLE\]', re.DOTALL)
+_SENTENCE_SPLIT_RE = re.compile(r'(?<=[.!?])\s+(?=[A-Z])')
+
+# Section header lines written by extract_text_from_html, e.g. "SECTION_2: Item 7. MD&A";
+# the level is everything up to the first colon, the title everything after it
+_SECTION_HEADER_RE = re.compile(r'SECTION_([^:]*)(?::(.*))?')
+
+# Section type by title keyword, checked in order; keywords match as substrings of the
+# lowercased title ("statements" counts as "statement"), one alternation per type
+_SECTION_TYPE_PATTERNS = tuple(
+    (re.compile('|'.join(map(re.escape, keywords))), section_type)
+    for keywords, section_type in (
+        (('financial', 'statement', 'income', 'balance', 'cash flow'), 'financial'),
+        (('risk', 'factor'), 'risk'),
+        (('business', 'overview', 'operation'), 'business'),
+        (('legal', 'proceeding', 'litigation'), 'legal'),
+        (('management', 'discussion', 'analysis', 'md&a'), 'mda'),
+    )
+)
+
+# Azure AI Search accepts at most 1000 documents or 16 MB per indexing request;
+# 1000 documents with 1536-dimension vectors can exceed the size limit, 500 can't
+_UPLOAD_BATCH_SIZE = 500
+# Indexing requests upload_documents keeps in flight over the shared SearchClient
+_UPLOAD_CONCURRENCY = 4
+
+# Semantic ranker configuration defined on the index (see create_index)
+_SEMANTIC_CONFIGURATION = "mySemanticConfig"
+
+# Server-side vector compression options for the index (see create_index)
+QUANTIZATION_MODES = ('none', 'scalar', 'binary')
+
+# End-of-stream marker passed between process_directory_streaming stages
+_STREAM_DONE = object()
+
+# Stable system message; kept first in every chat request so Azure OpenAI can reuse the cached prefix
+_SYSTEM_PROMPT = (
+    "You are a financial analyst expert. Use the provided context to answer questions about financial documents. "
+    "Provide specific, accurate answers based on the context. If the information is not in the context, say so clearly. "
+    "Always cite which company and year you're referencing."
+)
+
+# Default cap on generated answer tokens; callers can ask for more per query
+_ANSWER_MAX_TOKENS = 512
+
+# Query embeddings kept by EmbeddingService (1024 x 1536 float32 is about 6 MB)
+_QUERY_EMBEDDING_CACHE_SIZE = 1024
+
+# Tokens of retrieved context sent with each question; leaves room in an 8k window for the answer
+_CONTEXT_TOKEN_BUDGET = 6000
+
+# Embeddings of previously ingested chunks, keyed by content hash and deployment
+EMBEDDING_CACHE_PATH = Path.home() / ".azure_rag_embedding_cache.sqlite"
+
+
+def _utc_timestamp() -> str:
+    return datetime.now(timezone.utc).replace(microsecond=0).isoformat()
+
+
+def _content_hash(text: str) -> str:
+    """Stable hash of chunk text, used for document IDs and the embedding cache."""
+    return hashlib.blake2b(text.encode('utf-8'), digest_size=16).hexdigest()
+
+
+def _zero_embedding() -> np.ndarray:
+    """Fallback vector for failed embedding requests."""
+    return np.zeros(1536, dtype=np.float32)
+
+
+def _normalize(vectors: np.ndarray) -> np.ndarray:
+    """L2-normalize vectors along the last axis in place; zero vectors stay zero."""
+    vectors /= np.linalg.norm(vectors, axis=-1, keepdims=True) + 1e-12
+    return vectors
+
+
+def _vector_to_list(vector) -> List[float]:
+    # The Azure SDK JSON-encodes plain lists only
+    return vector.tolist() if isinstance(vector, np.ndarray) else vector
+
+
+def _serializable_documents(documents: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """Convert float32 vectors to lists at the last moment before handing documents to the SDK."""
+    return [
+        {**document, 'vector': document['vector'].tolist()}
+        if isinstance(document.get('vector'), np.ndarray) else document
+        for document in documents
+    ]
+
+
+def find_html_files(directory_path: str) -> List[str]:
+    """List the .htm/.html files directly inside a directory using cached scandir entry types."""
+    with os.scandir(directory_path) as entries:
+        return [
+            entry.path for entry in entries
+            if entry.name.endswith(('.htm', '.html')) and entry.is_file()
+        ]
+
+
+@lru_cache(maxsize=None)
+def _get_openai_client(api_key: Optional[str], api_version: str, azure_endpoint: Optional[str]) -> AzureOpenAI:
+    """One Azure OpenAI client per process and endpoint, sharing a single HTTP/2 connection pool."""
+    return AzureOpenAI(
+        api_key=api_key,
+        api_version=api_version,
+        azure_endpoint=azure_endpoint,
+        # Sized for the concurrent embedding requests of process_files plus queries
+        http_client=httpx.Client(
+            http2=_HTTP2_AVAILABLE,
+            limits=httpx.Limits(max_connections=32, max_keepalive_connections=32),
+            timeout=httpx.Timeout(60.0, connect=5.0)
+        )
+    )
+
+
+@lru_cache(maxsize=None)
+def _get_search_credential(search_key: Optional[str]):
+    """One search credential per key, so the search clients below can be shared."""
+    if search_key:
+        return AzureKeyCredential(search_key)
+    return DefaultAzureCredential()
+
+
+def _gzip_index_request(pipeline_request):
+    """raw_request_hook that gzips document indexing bodies, which are mostly JSON-encoded floats."""
+    request = pipeline_request.http_request
+    # The hook runs again on every retry of the same request
+    if '/docs/search.index' not in request.url or 'Content-Encoding' in request.headers:
+        return
+    body = request.content
+    if isinstance(body, str):
+        body = body.encode('utf-8')
+    request.set_bytes_body(gzip.compress(body, compresslevel=1))
+    request.headers['Content-Encoding'] = 'gzip'
+
+
+@lru_cache(maxsize=None)
+def _get_search_client(endpoint: str, index_name: str, credential, compress_uploads: bool = False) -> SearchClient:
+    options = {'raw_request_hook': _gzip_index_request} if compress_uploads else {}
+    return SearchClient(endpoint=endpoint, index_name=index_name, credential=credential, **options)
+
+
+@lru_cache(maxsize=None)
+def _get_index_client(endpoint: str, credential) -> SearchIndexClient:
+    return SearchIndexClient(endpoint=endpoint, credential=credential)
+
+
+# (service, index) pairs whose index has been created or updated by this process
+_VERIFIED_INDEXES = set()
+_VERIFIED_INDEXES_LOCK = threading.Lock()
+
 
 class AzureCredentialManager:
     """Manages Azure credentials and authentication."""
@@ -62,143 +289,272 @@ class AzureCredentialManager:
         self.openai_key = os.getenv('AZURE_OPENAI_API_KEY')
         
     def get_search_credential(self):
-        """Get Azure Search credential."""
-        if self.search_key:
-            return AzureKeyCredential(self.search_key)
-        else:
-            return DefaultAzureCredential()
+        """Get the process-wide Azure Search credential."""
+        return _get_search_credential(self.search_key)
     
     def get_openai_client(self):
-        """Get Azure OpenAI client."""
-        return AzureOpenAI(
-            api_key=self.openai_key,
-            api_version=os.getenv('AZURE_OPENAI_API_VERSION', '2024-02-01'),
-            azure_endpoint=os.getenv('AZURE_OPENAI_ENDPOINT')
+        """Get the process-wide Azure OpenAI client, backed by one keep-alive connection pool."""
+        return _get_openai_client(
+            self.openai_key,
+            os.getenv('AZURE_OPENAI_API_VERSION', '2024-02-01'),
+            os.getenv('AZURE_OPENAI_ENDPOINT')
+        )
+
+
+@lru_cache(maxsize=4)
+def _get_encoding(model: str = "gpt-4"):
+    """Shared tiktoken encoding for a model, so its BPE table is loaded once per process.
+
+    Encoding objects are thread-safe for encode/encode_ordinary_batch/decode, so the
+    parse workers, embedding service and query path can all use the same instance.
+    """
+    try:
+        return tiktoken.encoding_for_model(model)
+    except KeyError:
+        return tiktoken.get_encoding("cl100k_base")
+
+
+def _element_text(element) -> str:
+    """Concatenate an element's stripped descendant text nodes (comments excluded)."""
+    # map() keeps the per-node strip in C instead of a generator frame per text node
+    return ''.join(map(str.strip, _TEXT_NODES(element)))
+
+
+@dataclass
+class ChunkBatch(Sequence):
+    """Chunks of one file stored column-wise; the file metadata is shared, not copied per chunk."""
+    texts: List[str]
+    start_tokens: np.ndarray
+    token_counts: np.ndarray
+    file_metadata: Dict[str, Any]
+    chunk_ids: np.ndarray = None
+    content_hashes: List[str] = field(default_factory=list)
+    # Per-chunk section fields from the structured chunker (section_title, content_type, ...)
+    section_metadata: List[Dict[str, Any]] = field(default_factory=list)
+    
+    def __post_init__(self):
+        if self.chunk_ids is None:
+            self.chunk_ids = np.arange(len(self.texts), dtype=np.int32)
+        if not self.content_hashes:
+            self.content_hashes = [_content_hash(text) for text in self.texts]
+    
+    @classmethod
+    def from_windows(cls, texts: List[str], starts: List[int], token_counts: List[int],
+                     file_metadata: Dict[str, Any]) -> "ChunkBatch":
+        return cls(
+            texts=texts,
+            start_tokens=np.asarray(starts, dtype=np.int32),
+            token_counts=np.asarray(token_counts, dtype=np.int32),
+            file_metadata=file_metadata
         )
+    
+    @classmethod
+    def from_chunks(cls, chunks: List[Dict[str, Any]], file_metadata: Dict[str, Any]) -> "ChunkBatch":
+        """Build a batch from structured chunk dicts; their other keys become section metadata."""
+        texts = [chunk.pop('text') for chunk in chunks]
+        token_counts = [chunk.pop('token_count') for chunk in chunks]
+        starts = np.cumsum([0] + token_counts[:-1]) if chunks else []
+        batch = cls.from_windows(texts, starts, token_counts, file_metadata)
+        batch.section_metadata = chunks
+        return batch
+    
+    def __len__(self) -> int:
+        return len(self.texts)
+    
+    def __getitem__(self, index: int) -> Dict[str, Any]:
+        """Materialize one chunk as a flat dict of file metadata, section metadata and chunk fields."""
+        start = int(self.start_tokens[index])
+        token_count = int(self.token_counts[index])
+        chunk = self.file_metadata.copy()
+        if self.section_metadata:
+            chunk.update(self.section_metadata[index])
+        chunk.update({
+            'id': self.document_id(index),
+            'text': self.texts[index],
+            'content_hash': self.content_hashes[index],
+            'chunk_id': int(self.chunk_ids[index]),
+            'start_token': start,
+            'end_token': start + token_count,
+            'token_count': token_count,
+            'chunk_text_length': len(self.texts[index])
+        })
+        return chunk
+    
+    def document_id(self, index: int) -> str:
+        """Search document ID; stable for the same file, position and content."""
+        return (f"{self.file_metadata.get('company', 'unknown')}_{self.file_metadata.get('year', 'unknown')}_"
+                f"{self.chunk_ids[index]}_{self.content_hashes[index][:8]}")
 
 
 class DocumentProcessor:
     """Processes financial documents for RAG pipeline."""
     
-    def __init__(self, chunk_size: int = 1000, chunk_overlap: int = 200):
+    def __init__(self, chunk_size: int = 1000, chunk_overlap: int = _DEFAULT_CHUNK_OVERLAP,
+                 chunk_strategy: str = DEFAULT_CHUNK_STRATEGY):
+        if chunk_strategy not in CHUNK_STRATEGIES:
+            raise ValueError(f"Unknown chunk strategy: {chunk_strategy}")
+        if chunk_strategy == "semantic" and not SEMCHUNK_AVAILABLE:
+            raise ImportError("The semantic chunk strategy requires the semchunk package")
+        if chunk_overlap != _DEFAULT_CHUNK_OVERLAP:
+            logger.warning(f"chunk_overlap is deprecated and ignored; chunks never overlap (got {chunk_overlap})")
         self.chunk_size = chunk_size
         self.chunk_overlap = chunk_overlap
-        try:
-            self.tokenizer = tiktoken.encoding_for_model("gpt-4")
-        except KeyError:
-            self.tokenizer = tiktoken.get_encoding("cl100k_base")
-    
-    def extract_text_from_html(self, html_content: str) -> str:
-        """Extract structured text from HTML SEC filing with section and table markers."""
-        soup = BeautifulSoup(html_content, 'html.parser')
-        for script in soup(["script", "style"]):
-            script.decompose()
+        self.chunk_strategy = chunk_strategy
+        self.tokenizer = _get_encoding()
+        self._semantic_chunker = (
+            semchunk.chunkerify(self.tokenizer, chunk_size) if chunk_strategy == "semantic" else None
+        )
+    
+    def extract_text_from_html(self, html_content) -> str:
+        """Extract structured text from HTML SEC filing with section and table markers.
+        
+        html_content may be a str or the raw file bytes; bytes are decoded by libxml2
+        using the document's declared charset, else UTF-8.
+        """
+        if isinstance(html_content, str):
+            html_content = html_content.encode('utf-8')
+            parser = _HTML_PARSER
+        elif _META_CHARSET_RE.search(html_content[:1024]):
+            parser = _DECLARED_CHARSET_HTML_PARSER
+        else:
+            parser = _HTML_PARSER
+        root = etree.fromstring(html_content, parser=parser)
+        if root is None:
+            # Empty or whitespace-only document
+            return ""
+        etree.strip_elements(root, *_SKIPPED_TAGS, with_tail=False)
         text_parts = []
-        processed_elements = set()
-        all_elements = soup.find_all(['h1', 'h2', 'h3', 'h4', 'table', 'p', 'div', 'ul', 'ol'])
-        for element in all_elements:
-            if id(element) in processed_elements:
+        # One pass over start/end events. Each open block records whether it was
+        # extracted, so "inside an extracted block" is a counter instead of an
+        # ancestor walk per element
+        open_blocks = []
+        open_tables = []
+        extracted_depth = 0
+        for event, element in etree.iterwalk(root, events=('start', 'end'), tag=_BLOCK_TAGS):
+            tag = element.tag
+            if event == 'end':
+                extracted_depth -= open_blocks.pop()
+                if tag == 'table':
+                    open_tables.pop()
                 continue
-            if element.name in ['h1', 'h2', 'h3', 'h4']:
-                level = element.name[1]
-                header_text = element.get_text(strip=True)
+            if tag in _HEADER_TAGS:
+                level = tag[1]
+                header_text = _element_text(element)
                 if header_text and len(header_text) > 3:
                     marker = "\n" + "=" * max(20, 60 - int(level) * 10) + "\n"
                     text_parts.append(f"{marker}SECTION_{level}: {header_text}{marker}")
-                processed_elements.add(id(element))
-            elif element.name == 'table':
-                parent_table = element.find_parent('table')
-                if parent_table and id(parent_table) not in processed_elements:
-                    continue
-                table_text = self._extract_table_text(element)
-                if table_text and len(table_text.strip()) > 50:
-                    text_parts.append(f"\n[FINANCIAL_TABLE]\n{table_text}\n[/FINANCIAL_TABLE]\n")
-                processed_elements.add(id(element))
-            elif element.name in ['p', 'div']:
-                parent_processed = False
-                for parent in element.parents:
-                    if id(parent) in processed_elements:
-                        parent_processed = True
-                        break
-                if not parent_processed:
-                    para_text = element.get_text(strip=True)
-                    if para_text and len(para_text) > 20:
-                        text_parts.append(para_text)
-                    processed_elements.add(id(element))
-            elif element.name in ['ul', 'ol']:
-                parent_processed = False
-                for parent in element.parents:
-                    if id(parent) in processed_elements:
-                        parent_processed = True
-                        break
-                if not parent_processed:
-                    list_text = self._extract_list_text(element)
-                    if list_text:
-                        text_parts.append(list_text)
-                    processed_elements.add(id(element))
+                extracted = True
+            elif tag == 'table':
+                # Nested tables are only extracted when their enclosing table was
+                extracted = not open_tables or open_tables[-1]
+                if extracted:
+                    table_text = self._extract_table_text(element)
+                    if table_text and len(table_text.strip()) > 50:
+                        text_parts.append(f"\n[FINANCIAL_TABLE]\n{table_text}\n[/FINANCIAL_TABLE]\n")
+                open_tables.append(extracted)
+            else:
+                extracted = not extracted_depth
+                if extracted:
+                    if tag in _PARAGRAPH_TAGS:
+                        para_text = _element_text(element)
+                        if para_text and len(para_text) > 20:
+                            text_parts.append(para_text)
+                    else:
+                        list_text = self._extract_list_text(element)
+                        if list_text:
+                            text_parts.append(list_text)
+            open_blocks.append(extracted)
+            extracted_depth += extracted
         return '\n\n'.join(text_parts)
 
     def _extract_table_text(self, table) -> str:
+        if table.find('.//table') is None:
+            headers = [text for text in map(_element_text, table.iter('th')) if text]
+            row_cells = [[_element_text(cell) for cell in row.iter('td')] for row in table.iter('tr')]
+        else:
+            headers, row_cells = self._nested_table_cells(table)
         rows = []
-        headers = []
-        for header in table.find_all(['th']):
-            header_text = header.get_text(strip=True)
-            if header_text:
-                headers.append(header_text)
         if headers:
             rows.append(" | ".join(headers))
             rows.append("-" * 50)
-        for row in table.find_all('tr'):
-            cells = row.find_all(['td'])
-            cell_texts = [cell.get_text(strip=True) for cell in cells]
-            if cell_texts:
-                rows.append(" | ".join(cell_texts))
+        rows.extend(" | ".join(cells) for cells in row_cells if cells)
         return '\n'.join(rows)
 
+    @staticmethod
+    def _nested_table_cells(table) -> Tuple[List[str], List[List[str]]]:
+        """Header texts and per-row cell texts of a table containing other tables, in one pass.
+        
+        A cell belongs to every row it is nested in, rows of inner tables included, so it is
+        added to all open rows; its text is computed once instead of once per enclosing row.
+        """
+        headers = []
+        row_cells = []
+        open_rows = []
+        for event, element in etree.iterwalk(table, events=('start', 'end'), tag=('th', 'tr', 'td')):
+            tag = element.tag
+            if tag == 'tr':
+                if event == 'start':
+                    open_rows.append(len(row_cells))
+                    row_cells.append([])
+                else:
+                    open_rows.pop()
+            elif event == 'start':
+                cell_text = _element_text(element)
+                if tag == 'th':
+                    if cell_text:
+                        headers.append(cell_text)
+                else:
+                    for row in open_rows:
+                        row_cells[row].append(cell_text)
+        return headers, row_cells
+
     def _extract_list_text(self, element) -> str:
-        items = [li.get_text(strip=True) for li in element.find_all('li')]
+        items = [_element_text(li) for li in element.iter('li')]
         if items:
             return '\n'.join([f"- {item}" for item in items])
         return ""
 
-    def chunk_text(self, text: str, metadata: Dict[str, Any]) -> List[Dict[str, Any]]:
+    def chunk_text(self, text: str, metadata: Dict[str, Any]) -> ChunkBatch:
         """Split text into chunks with token limits, respecting 10-K document structure."""
         chunks = []
         sections = self._identify_sections(text)
         for section in sections:
-            section_chunks = self._chunk_section(section, metadata)
+            # File metadata is shared by the batch rather than copied into every chunk
+            section_chunks = self._chunk_section(section)
             chunks.extend(section_chunks)
-        return chunks
+        return ChunkBatch.from_chunks(chunks, metadata)
 
     def _identify_sections(self, text: str) -> List[Dict[str, Any]]:
         sections = []
-        current_section = ""
+        # Lines are collected and joined once per section; += would copy the section body per line
+        current_section_lines = []
         current_section_title = ""
         current_section_level = 0
         lines = text.split('\n')
         for line in lines:
             line = line.strip()
-            if line.startswith('SECTION_'):
-                if current_section.strip():
+            header = _SECTION_HEADER_RE.match(line)
+            if header:
+                if current_section_lines:
                     sections.append({
                         'title': current_section_title,
-                        'content': current_section.strip(),
+                        'content': '\n'.join(current_section_lines),
                         'level': current_section_level,
                         'type': self._classify_section_type(current_section_title)
                     })
-                level_match = line.split('SECTION_')[1].split(':')[0]
-                current_section_level = int(level_match) if level_match.isdigit() else 1
-                current_section_title = line.split(':', 1)[1].strip() if ':' in line else line
-                current_section = ""
+                level, title = header.groups()
+                current_section_level = int(level) if level.isdigit() else 1
+                current_section_title = title.strip() if title is not None else line
+                current_section_lines = []
             elif line.startswith('='):
                 continue
             else:
                 if line:
-                    current_section += line + '\n'
-        if current_section.strip():
+                    current_section_lines.append(line)
+        if current_section_lines:
             sections.append({
                 'title': current_section_title,
-                'content': current_section.strip(),
+                'content': '\n'.join(current_section_lines),
                 'level': current_section_level,
                 'type': self._classify_section_type(current_section_title)
             })
@@ -213,18 +569,10 @@ class DocumentProcessor:
 
     def _classify_section_type(self, title: str) -> str:
         title_lower = title.lower()
-        if any(keyword in title_lower for keyword in ['financial', 'statement', 'income', 'balance', 'cash flow']):
-            return 'financial'
-        elif any(keyword in title_lower for keyword in ['risk', 'factor']):
-            return 'risk'
-        elif any(keyword in title_lower for keyword in ['business', 'overview', 'operation']):
-            return 'business'
-        elif any(keyword in title_lower for keyword in ['legal', 'proceeding', 'litigation']):
-            return 'legal'
-        elif any(keyword in title_lower for keyword in ['management', 'discussion', 'analysis', 'md&a']):
-            return 'mda'
-        else:
-            return 'general'
+        for pattern, section_type in _SECTION_TYPE_PATTERNS:
+            if pattern.search(title_lower):
+                return section_type
+        return 'general'
 
     def _chunk_section(self, section: Dict, metadata: Optional[Dict] = None) -> List[Dict[str, Any]]:
         content = section['content']
@@ -232,7 +580,7 @@ class DocumentProcessor:
         if '[FINANCIAL_TABLE]' in content:
             table_chunks = self._chunk_financial_tables(content, section, metadata)
             section_chunks.extend(table_chunks)
-            content = re.sub(r'\[FINANCIAL_TABLE\].*?\[/FINANCIAL_TABLE\]', '', content, flags=re.DOTALL)
+            content = _TABLE_RE.sub('', content)
         if content.strip():
             regular_chunks = self._chunk_regular_content(content, section, metadata)
             section_chunks.extend(regular_chunks)
@@ -240,10 +588,9 @@ class DocumentProcessor:
 
     def _chunk_financial_tables(self, content: str, section: Dict, metadata: Optional[Dict] = None) -> List[Dict[str, Any]]:
         chunks = []
-        table_pattern = r'\[FINANCIAL_TABLE\](.*?)\[/FINANCIAL_TABLE\]'
-        tables = re.findall(table_pattern, content, re.DOTALL)
+        tables = [table.strip() for table in _TABLE_RE.findall(content)]
+        table_lengths = [len(tokens) for tokens in self.tokenizer.encode_ordinary_batch(tables)]
         for i, table_content in enumerate(tables):
-            table_content = table_content.strip()
             if not table_content:
                 continue
             chunk_metadata = {
@@ -255,32 +602,30 @@ class DocumentProcessor:
             }
             if metadata:
                 chunk_metadata.update(metadata)
-            table_tokens = self.tokenizer.encode(table_content)
-            if len(table_tokens) <= self.chunk_size:
-                chunks.append(self._create_chunk(table_content, chunk_metadata))
+            if table_lengths[i] <= self.chunk_size:
+                chunks.append(self._create_chunk(table_content, chunk_metadata, table_lengths[i]))
             else:
                 rows = table_content.split('\n')
-                current_chunk = ""
+                row_lengths = [len(tokens) for tokens in self.tokenizer.encode_ordinary_batch(rows)]
+                current_rows = []
                 current_tokens = 0
-                for row in rows:
-                    row_tokens = len(self.tokenizer.encode(row))
+                for row, row_tokens in zip(rows, row_lengths):
                     if current_tokens + row_tokens > self.chunk_size:
-                        if current_chunk:
-                            chunks.append(self._create_chunk(current_chunk.strip(), chunk_metadata))
-                        current_chunk = row + '\n'
+                        if current_rows:
+                            chunks.append(self._create_chunk('\n'.join(current_rows).strip(), chunk_metadata,
+                                                             current_tokens))
+                        current_rows = [row]
                         current_tokens = row_tokens
                     else:
-                        current_chunk += row + '\n'
+                        current_rows.append(row)
                         current_tokens += row_tokens
-                if current_chunk.strip():
-                    chunks.append(self._create_chunk(current_chunk.strip(), chunk_metadata))
+                current_chunk = '\n'.join(current_rows).strip()
+                if current_chunk:
+                    chunks.append(self._create_chunk(current_chunk, chunk_metadata, current_tokens))
         return chunks
 
     def _chunk_regular_content(self, content: str, section: Dict, metadata: Optional[Dict] = None) -> List[Dict[str, Any]]:
         chunks = []
-        paragraphs = content.split('\n\n')
-        current_chunk = ""
-        current_tokens = 0
         chunk_metadata = {
             'section_title': section['title'],
             'section_level': section['level'],
@@ -289,121 +634,142 @@ class DocumentProcessor:
         }
         if metadata:
             chunk_metadata.update(metadata)
-        for paragraph in paragraphs:
-            paragraph = paragraph.strip()
-            if not paragraph:
-                continue
-            paragraph_tokens = len(self.tokenizer.encode(paragraph))
-            if paragraph_tokens > self.chunk_size:
-                sentences = re.split(r'(?<=[.!?])\s+(?=[A-Z])', paragraph)
-                for sentence in sentences:
-                    sentence_tokens = len(self.tokenizer.encode(sentence))
-                    if current_tokens + sentence_tokens > self.chunk_size:
-                        if current_chunk:
-                            chunks.append(self._create_chunk(current_chunk, chunk_metadata))
-                        current_chunk = sentence
-                        current_tokens = sentence_tokens
-                    else:
-                        if current_chunk:
-                            current_chunk += " " + sentence
-                        else:
-                            current_chunk = sentence
-                        current_tokens += sentence_tokens
-            else:
-                if current_tokens + paragraph_tokens > self.chunk_size:
-                    if current_chunk:
-                        chunks.append(self._create_chunk(current_chunk, chunk_metadata))
-                    current_chunk = paragraph
-                    current_tokens = paragraph_tokens
+        # One batched encode for every paragraph instead of a tokenizer call per paragraph
+        paragraphs = [paragraph for paragraph in map(str.strip, content.split('\n\n')) if paragraph]
+        paragraph_lengths = [len(tokens) for tokens in self.tokenizer.encode_ordinary_batch(paragraphs)]
+        # Packing units, the separator joining each to the one before it, and token counts.
+        # Paragraphs over the chunk size are packed sentence by sentence; their sentences
+        # are encoded in one more batch
+        units = paragraphs
+        separators = None
+        lengths = paragraph_lengths
+        if paragraph_lengths and max(paragraph_lengths) > self.chunk_size:
+            oversized = [_SENTENCE_SPLIT_RE.split(paragraph)
+                         for paragraph, n_tokens in zip(paragraphs, paragraph_lengths) if n_tokens > self.chunk_size]
+            sentence_lengths = iter([
+                len(tokens)
+                for tokens in self.tokenizer.encode_ordinary_batch([sentence for sentences in oversized
+                                                                   for sentence in sentences])
+            ])
+            oversized = iter(oversized)
+            units = []
+            separators = []
+            lengths = []
+            for paragraph, n_tokens in zip(paragraphs, paragraph_lengths):
+                if n_tokens > self.chunk_size:
+                    for sentence in next(oversized):
+                        units.append(sentence)
+                        separators.append(" ")
+                        lengths.append(next(sentence_lengths))
                 else:
-                    if current_chunk:
-                        current_chunk += "\n\n" + paragraph
-                    else:
-                        current_chunk = paragraph
-                    current_tokens += paragraph_tokens
-        if current_chunk:
-            chunks.append(self._create_chunk(current_chunk, chunk_metadata))
+                    units.append(paragraph)
+                    separators.append("\n\n")
+                    lengths.append(n_tokens)
+        # Greedy packing on the running token total: each chunk ends at the last unit
+        # that keeps it within chunk_size, found by binary search; a unit larger than
+        # chunk_size on its own becomes a chunk by itself
+        ends = list(accumulate(lengths))
+        start = 0
+        while start < len(units):
+            base = ends[start - 1] if start else 0
+            end = max(bisect_right(ends, base + self.chunk_size, start), start + 1)
+            if separators is None:
+                text = "\n\n".join(units[start:end])
+            else:
+                text = units[start] + ''.join(
+                    chain.from_iterable(zip(separators[start + 1:end], units[start + 1:end]))
+                )
+            chunks.append(self._create_chunk(text, chunk_metadata, ends[end - 1] - base))
+            start = end
         return chunks
 
-    def _create_chunk(self, text: str, metadata: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+    def _create_chunk(self, text: str, metadata: Optional[Dict[str, Any]] = None,
+                      token_count: Optional[int] = None) -> Dict[str, Any]:
+        # Callers pass the token count they accumulated while building the chunk
+        if token_count is None:
+            token_count = len(self.tokenizer.encode(text))
         chunk = {
             'text': text.strip(),
-            'token_count': len(self.tokenizer.encode(text))
+            'token_count': token_count
         }
         if metadata:
             chunk.update(metadata)
-        chunk['id'] = f"{metadata.get('company', 'unknown')}_{metadata.get('year', 'unknown')}_{metadata.get('chunk_id', 0)}"
         return chunk
     
-    def extract_metadata(self, filename: str) -> Dict[str, Any]:
+    def extract_metadata(self, filename: str, processed_date: Optional[str] = None) -> Dict[str, Any]:
         """Extract metadata from filename."""
-        now = datetime.now(timezone.utc).replace(microsecond=0)
         metadata = {
             'filename': filename,
-            'processed_date': now.isoformat()
+            'processed_date': processed_date or _utc_timestamp()
         }
         
-        # Extract company symbol from filename (e.g., "GOOGL_10K_2023_xxx.htm")
-        if '_' in filename:
-            parts = filename.split('_')
+        # Company, filing type and year from the scraper's naming scheme
+        match = _FILENAME_RE.match(filename)
+        if match:
+            metadata.update(match.groupdict())
+        else:
+            # Other underscore-separated names (e.g. "MSFT_10-K_2023.htm") are read positionally
+            parts = Path(filename).stem.split('_')
             if len(parts) >= 3:
-                metadata['company'] = parts[0]
-                metadata['filing_type'] = parts[1]
-                metadata['year'] = parts[2]
+                metadata['company'], metadata['filing_type'], metadata['year'] = parts[:3]
+            else:
+                logger.warning(f"Unrecognized filing filename: {filename}")
         
         return metadata
     
-    def chunk_text(self, text: str, metadata: Dict[str, Any]) -> List[Dict[str, Any]]:
-        """Split text into overlapping chunks."""
-        # Tokenize the text
-        tokens = self.tokenizer.encode(text)
+    def chunk_text_regex(self, text: str, metadata: Dict[str, Any]) -> ChunkBatch:
+        """Split text on a precompiled separator alternation and pack pieces greedily up to chunk_size tokens."""
+        parts = [part for part in _SEP_RE.split(text) if part]
+        part_tokens = [len(tokens) for tokens in self.tokenizer.encode_ordinary_batch(parts)]
         
-        chunks = []
+        texts = []
+        starts = []
+        token_counts = []
+        current_parts = []
+        current_tokens = 0
         start = 0
-        chunk_id = 0
-        
-        while start < len(tokens):
-            # Calculate end position
-            end = min(start + self.chunk_size, len(tokens))
-            
-            # Get chunk tokens and decode
-            chunk_tokens = tokens[start:end]
-            chunk_text = self.tokenizer.decode(chunk_tokens)
-            
-            # Create chunk metadata
-            chunk_metadata = metadata.copy()
-            chunk_metadata.update({
-                'chunk_id': chunk_id,
-                'start_token': start,
-                'end_token': end,
-                'token_count': len(chunk_tokens),
-                'chunk_text_length': len(chunk_text)
-            })
-            
-            chunks.append({
-                'text': chunk_text,
-                'metadata': chunk_metadata,
-                'id': f"{metadata.get('company', 'unknown')}_{metadata.get('year', 'unknown')}_{chunk_id}"
-            })
-            
-            # Move to next chunk with overlap
-            start += self.chunk_size - self.chunk_overlap
-            chunk_id += 1
-        
-        return chunks
+        for part, n_tokens in zip(parts, part_tokens):
+            if current_parts and current_tokens + n_tokens > self.chunk_size:
+                texts.append(''.join(current_parts))
+                starts.append(start)
+                token_counts.append(current_tokens)
+                start += current_tokens
+                current_parts = []
+                current_tokens = 0
+            current_parts.append(part)
+            current_tokens += n_tokens
+        if current_parts:
+            texts.append(''.join(current_parts))
+            starts.append(start)
+            token_counts.append(current_tokens)
+        return ChunkBatch.from_windows(texts, starts, token_counts, metadata)
+    
+    def chunk_text_semantic(self, text: str, metadata: Dict[str, Any]) -> ChunkBatch:
+        """Split text with semchunk's semantic splitter."""
+        texts = list(self._semantic_chunker(text))
+        token_counts = [len(tokens) for tokens in self.tokenizer.encode_ordinary_batch(texts)]
+        starts = np.cumsum([0] + token_counts[:-1]) if texts else []
+        return ChunkBatch.from_windows(texts, starts, token_counts, metadata)
     
-    def process_file(self, file_path: str) -> List[Dict[str, Any]]:
+    def process_file(self, file_path: str, processed_date: Optional[str] = None) -> ChunkBatch:
         """Process a single file and return chunks."""
         try:
-            with open(file_path, 'r', encoding='utf-8') as f:
+            # lxml parses the raw bytes, skipping the UTF-8 decode; lxml before 6.0 only
+            # accepts str or bytes, not a memory-mapped file
+            with open(file_path, 'rb') as f:
                 content = f.read()
+            text = self.extract_text_from_html(content) if content else ""
             
-            # Extract text and metadata
-            text = self.extract_text_from_html(content)
-            metadata = self.extract_metadata(Path(file_path).name)
+            # Extract metadata
+            metadata = self.extract_metadata(Path(file_path).name, processed_date)
             
             # Create chunks
-            chunks = self.chunk_text(text, metadata)
+            if self.chunk_strategy == "regex-dfa":
+                chunks = self.chunk_text_regex(text, metadata)
+            elif self.chunk_strategy == "semantic":
+                chunks = self.chunk_text_semantic(text, metadata)
+            else:
+                chunks = self.chunk_text(text, metadata)
             
             logger.info(f"Processed {file_path}: {len(chunks)} chunks created")
             return chunks
@@ -413,25 +779,43 @@ class DocumentProcessor:
             return []
 
 
+# Per-process DocumentProcessor reused by _parse_and_chunk across files
+_WORKER_PROCESSOR = None
+
+
+def _parse_and_chunk(file_path: str, chunk_size: int = 1000, chunk_strategy: str = DEFAULT_CHUNK_STRATEGY,
+                     processed_date: Optional[str] = None) -> ChunkBatch:
+    """Parse and chunk one file; runs in ProcessPoolExecutor workers."""
+    global _WORKER_PROCESSOR
+    if _WORKER_PROCESSOR is None or (
+            _WORKER_PROCESSOR.chunk_size, _WORKER_PROCESSOR.chunk_strategy) != (chunk_size, chunk_strategy):
+        _WORKER_PROCESSOR = DocumentProcessor(chunk_size, chunk_strategy=chunk_strategy)
+    return _WORKER_PROCESSOR.process_file(file_path, processed_date)
+
+
 class AzureSearchManager:
     """Manages Azure AI Search operations."""
     
-    def __init__(self, service_name: str, index_name: str, credential_manager: AzureCredentialManager):
+    def __init__(self, service_name: str, index_name: str, credential_manager: AzureCredentialManager,
+                 quantization: str = "none", compress_uploads: bool = False):
+        if quantization not in QUANTIZATION_MODES:
+            raise ValueError(f"Unknown quantization mode: {quantization}")
         self.service_name = service_name
         self.index_name = index_name
+        self.quantization = quantization
+        # Gzip indexing requests (about 2.3x fewer bytes for 1536-d vectors) at some CPU cost
+        self.compress_uploads = compress_uploads
         self.credential = credential_manager.get_search_credential()
         
-        # Initialize clients
-        self.search_client = SearchClient(
-            endpoint=f"https://{service_name}.search.windows.net",
-            index_name=index_name,
-            credential=self.credential
-        )
+        # Clients are shared by every manager in the process for the same service and index
+        endpoint = f"https://{service_name}.search.windows.net"
+        self.search_client = _get_search_client(endpoint, index_name, self.credential, compress_uploads)
+        self.index_client = _get_index_client(endpoint, self.credential)
         
-        self.index_client = SearchIndexClient(
-            endpoint=f"https://{service_name}.search.windows.net",
-            credential=self.credential
-        )
+        # Opened on first queued upload so query-only runs don't start its flush timer
+        self.buffered_sender = None
+        self._buffered_uploaded = 0
+        self._buffered_lock = threading.Lock()
     
     def create_index(self, vector_dimensions: int = 1536):
         """Create or update the search index."""
@@ -442,6 +826,9 @@ class AzureSearchManager:
                 name="vector",
                 type=SearchFieldDataType.Collection(SearchFieldDataType.Single),
                 searchable=True,
+                # Vectors are never returned in results, so keep only the HNSW copy
+                hidden=True,
+                stored=False,
                 vector_search_dimensions=vector_dimensions,
                 vector_search_profile_name="myHnswProfile"
             ),
@@ -453,27 +840,52 @@ class AzureSearchManager:
             SimpleField(name="processed_date", type=SearchFieldDataType.DateTimeOffset, filterable=True)
         ]
         
-        # Configure vector search
+        # Configure vector search; quantized vectors are reranked against the originals
+        compressions = []
+        rescoring_options = RescoringOptions(enable_rescoring=True, default_oversampling=10.0)
+        if self.quantization == "scalar":
+            compressions.append(ScalarQuantizationCompression(
+                compression_name="myCompression",
+                rescoring_options=rescoring_options,
+                parameters=ScalarQuantizationParameters(quantized_data_type="int8")
+            ))
+        elif self.quantization == "binary":
+            compressions.append(BinaryQuantizationCompression(
+                compression_name="myCompression",
+                rescoring_options=rescoring_options
+            ))
+        
         vector_search = VectorSearch(
             profiles=[VectorSearchProfile(
                 name="myHnswProfile",
-                algorithm_configuration_name="myHnsw"
+                algorithm_configuration_name="myHnsw",
+                compression_name="myCompression" if compressions else None
             )],
+            compressions=compressions or None,
             algorithms=[HnswAlgorithmConfiguration(
                 name="myHnsw",
+                # m=16 gives good recall on 1536-d embeddings; efSearch=64 is ample for small top_k.
+                # Vectors are unit-normalized by EmbeddingService, so dot product ranks like cosine
                 parameters={
-                    "m": 4,
-                    "efConstruction": 400,
-                    "efSearch": 500,
-                    "metric": "cosine"
+                    "m": 16,
+                    "efConstruction": 200,
+                    "efSearch": 64,
+                    "metric": "dotProduct"
                 }
             )]
         )
         
+        # Used by search(semantic=True) to rerank hybrid results
+        semantic_search = SemanticSearch(configurations=[SemanticConfiguration(
+            name=_SEMANTIC_CONFIGURATION,
+            prioritized_fields=SemanticPrioritizedFields(content_fields=[SemanticField(field_name="content")])
+        )])
+        
         index = SearchIndex(
             name=self.index_name,
             fields=fields,
-            vector_search=vector_search
+            vector_search=vector_search,
+            semantic_search=semantic_search
         )
         
         try:
@@ -484,31 +896,108 @@ class AzureSearchManager:
             logger.error(f"Error creating index: {e}")
             return False
     
+    def ensure_index(self) -> bool:
+        """Create or update the index once per process; later calls skip the round-trip."""
+        key = (self.service_name, self.index_name)
+        with _VERIFIED_INDEXES_LOCK:
+            # Only successes are remembered, so a failed attempt is retried next time
+            if key not in _VERIFIED_INDEXES and self.create_index():
+                _VERIFIED_INDEXES.add(key)
+            return key in _VERIFIED_INDEXES
+    
     def upload_documents(self, documents: List[Dict[str, Any]]):
-        """Upload documents to Azure Search."""
+        """Upload documents to Azure Search in concurrent batches of up to 500."""
+        documents = _serializable_documents(documents)
+        batches = [documents[start:start + _UPLOAD_BATCH_SIZE]
+                   for start in range(0, len(documents), _UPLOAD_BATCH_SIZE)]
+        if len(batches) > 1:
+            with ThreadPoolExecutor(max_workers=min(_UPLOAD_CONCURRENCY, len(batches))) as pool:
+                successful = sum(pool.map(self._upload_batch, batches))
+        else:
+            successful = sum(map(self._upload_batch, batches))
+        logger.info(f"Uploaded {successful}/{len(documents)} documents to Azure Search")
+        return successful
+    
+    def _upload_batch(self, batch: List[Dict[str, Any]]) -> int:
+        """Upload one indexing request; returns the documents that succeeded."""
         try:
-            result = self.search_client.upload_documents(documents)
-            successful = sum(1 for r in result if r.succeeded)
-            logger.info(f"Uploaded {successful}/{len(documents)} documents to Azure Search")
-            return successful
+            result = self.search_client.upload_documents(documents=batch)
+            return sum(1 for r in result if r.succeeded)
         except Exception as e:
             logger.error(f"Error uploading documents: {e}")
             return 0
     
-    def search(self, query_vector: List[float], top_k: int = 5, filters: Optional[str] = None) -> List[Dict[str, Any]]:
-        """Perform vector search."""
+    def queue_documents(self, documents: List[Dict[str, Any]]):
+        """Queue documents on the buffered sender, which batches, retries and flushes them."""
+        if self.buffered_sender is None:
+            self.buffered_sender = SearchIndexingBufferedSender(
+                endpoint=f"https://{self.service_name}.search.windows.net",
+                index_name=self.index_name,
+                credential=self.credential,
+                auto_flush_interval=10,
+                initial_batch_action_count=_UPLOAD_BATCH_SIZE,
+                on_progress=self._on_document_uploaded,
+                on_error=self._on_document_failed,
+                **({'raw_request_hook': _gzip_index_request} if self.compress_uploads else {})
+            )
+        self.buffered_sender.upload_documents(_serializable_documents(documents))
+    
+    @property
+    def queued_uploaded_count(self) -> int:
+        """Documents the buffered sender has uploaded so far."""
+        return self._buffered_uploaded
+    
+    def close_buffered_sender(self) -> int:
+        """Flush and close the buffered sender; returns the documents it uploaded."""
+        if self.buffered_sender is None:
+            return 0
+        try:
+            self.buffered_sender.close()
+        except Exception as e:
+            logger.error(f"Error flushing documents: {e}")
+        self.buffered_sender = None
+        with self._buffered_lock:
+            successful, self._buffered_uploaded = self._buffered_uploaded, 0
+        logger.info(f"Uploaded {successful} documents to Azure Search")
+        return successful
+    
+    def _on_document_uploaded(self, action):
+        # Called from the sender's flush timer thread as well as the caller's
+        with self._buffered_lock:
+            self._buffered_uploaded += 1
+    
+    def _on_document_failed(self, action):
+        logger.error(f"Error uploading document: {action.additional_properties.get('id')}")
+    
+    def search(self, query_vector: np.ndarray, top_k: int = 5, filters: Optional[str] = None,
+               exhaustive: bool = False, query_text: Optional[str] = None,
+               semantic: bool = False) -> List[Dict[str, Any]]:
+        """
+        Perform vector search, or hybrid search when query_text is given.
+        
+        Hybrid search adds BM25 matching on query_text (company names, tickers)
+        and fuses both rankings with Reciprocal Rank Fusion. semantic=True
+        reranks the hybrid results with the semantic ranker, which needs a
+        search tier that has it enabled. exhaustive=True trades HNSW latency
+        for exact nearest neighbors.
+        """
+        options = {}
+        if semantic:
+            options = {'query_type': "semantic", 'semantic_configuration_name': _SEMANTIC_CONFIGURATION}
         try:
             search_results = self.search_client.search(
-                search_text="",
+                search_text=query_text or "",
                 vector_queries=[{
-                    "vector": query_vector,
+                    "vector": _vector_to_list(query_vector),
                     "k_nearest_neighbors": top_k,
                     "fields": "vector",
-                    "kind": "vector"
+                    "kind": "vector",
+                    "exhaustive": exhaustive
                 }],
                 filter=filters,
                 select=["id", "content", "company", "year", "filing_type", "chunk_id"],
-                top=top_k
+                top=top_k,
+                **options
             )
             
             results = []
@@ -551,30 +1040,142 @@ class AzureSearchManager:
 class EmbeddingService:
     """Handles text embedding generation using Azure OpenAI."""
     
-    def __init__(self, credential_manager: AzureCredentialManager, deployment_name: str = "text-embedding-ada-002"):
+    def __init__(self, credential_manager: AzureCredentialManager, deployment_name: str = "text-embedding-ada-002",
+                 batch_size: int = 128, max_batch_tokens: int = 8191):
         self.client = credential_manager.get_openai_client()
         self.deployment_name = deployment_name
+        self.batch_size = batch_size
+        self.max_batch_tokens = max_batch_tokens
+        self.tokenizer = _get_encoding()
+        # Recent query embeddings, keyed on whitespace-normalized query text
+        self._cached_query_embedding = lru_cache(maxsize=_QUERY_EMBEDDING_CACHE_SIZE)(self._create_embedding)
+    
+    def _create_embedding(self, text: str) -> np.ndarray:
+        response = self.client.embeddings.create(
+            input=text,
+            model=self.deployment_name
+        )
+        return _normalize(np.asarray(response.data[0].embedding, dtype=np.float32))
+    
+    def get_query_embedding(self, text: str) -> np.ndarray:
+        """Generate embedding for a query, reusing results for repeated queries."""
+        try:
+            return self._cached_query_embedding(' '.join(text.split()))
+        except Exception as e:
+            logger.error(f"Error generating query embedding: {e}")
+            return _zero_embedding()
     
-    def get_embedding(self, text: str) -> List[float]:
+    def warmup(self):
+        """Prime the HTTP connection pool so the next request skips connection setup."""
+        try:
+            self._create_embedding("warmup")
+        except Exception as e:
+            logger.debug(f"Embedding warmup failed: {e}")
+    
+    def get_embedding(self, text: str) -> np.ndarray:
         """Generate embedding for text."""
+        try:
+            return self._create_embedding(text)
+        except Exception as e:
+            logger.error(f"Error generating embedding: {e}")
+            # Return zero vector as fallback
+            return _zero_embedding()
+    
+    def get_embeddings_batch(self, texts: List[str], token_counts: Optional[List[int]] = None,
+                             concurrency: int = 8) -> np.ndarray:
+        """
+        Generate embeddings for multiple texts, batching requests by item count and token budget.
+        
+        token_counts, when the caller already has them (e.g. from chunking), saves re-tokenizing
+        the texts to size the requests. Up to concurrency requests are in flight at once.
+        Returns one contiguous (len(texts), dimensions) float32 array of unit vectors, in input order.
+        """
+        batches = self._split_batches(texts, token_counts)
+        if len(batches) > 1 and concurrency > 1:
+            with ThreadPoolExecutor(max_workers=min(concurrency, len(batches))) as pool:
+                embeddings = list(pool.map(self._embed_request, batches))
+        else:
+            embeddings = [self._embed_request(batch) for batch in batches]
+        dimensions = next((part.shape[1] for part in embeddings if not isinstance(part, int)), 1536)
+        return np.concatenate([
+            np.zeros((part, dimensions), dtype=np.float32) if isinstance(part, int) else part
+            for part in embeddings
+        ] or [np.zeros((0, dimensions), dtype=np.float32)])
+    
+    def _embed_request(self, batch: List[str]):
+        """Embed one request batch; on failure returns the batch size so it can be zero-filled."""
         try:
             response = self.client.embeddings.create(
-                input=text,
+                input=batch,
                 model=self.deployment_name
             )
-            return response.data[0].embedding
+            return _normalize(np.asarray(
+                [item.embedding for item in sorted(response.data, key=lambda item: item.index)],
+                dtype=np.float32
+            ))
         except Exception as e:
-            logger.error(f"Error generating embedding: {e}")
-            # Return zero vector as fallback
-            return [0.0] * 1536
+            logger.error(f"Error generating batch embeddings: {e}")
+            # Filled with zero vectors as fallback once the dimensions are known
+            return len(batch)
+    
+    def _split_batches(self, texts: List[str], token_counts: Optional[List[int]] = None) -> List[List[str]]:
+        """Split texts into request batches of at most batch_size items and max_batch_tokens tokens."""
+        if token_counts is None:
+            token_counts = [len(tokens) for tokens in self.tokenizer.encode_ordinary_batch(texts)]
+        batches = []
+        batch = []
+        batch_tokens = 0
+        for text, n_tokens in zip(texts, token_counts):
+            if batch and (len(batch) >= self.batch_size or batch_tokens + n_tokens > self.max_batch_tokens):
+                batches.append(batch)
+                batch = []
+                batch_tokens = 0
+            batch.append(text)
+            batch_tokens += n_tokens
+        if batch:
+            batches.append(batch)
+        return batches
+
+
+class EmbeddingCache:
+    """SQLite store of float32 chunk embeddings keyed by content hash and embedding deployment."""
+    
+    def __init__(self, path, deployment_name: str):
+        self.deployment_name = deployment_name
+        # Shared by the embedding threads; the lock serializes access to the connection
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(str(path), check_same_thread=False)
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS embeddings_float32 ("
+            "content_hash TEXT NOT NULL, deployment TEXT NOT NULL, vector BLOB NOT NULL, "
+            "PRIMARY KEY (content_hash, deployment))"
+        )
+        self._conn.commit()
+    
+    def get_many(self, hashes: List[str]) -> Dict[str, np.ndarray]:
+        """Return cached embeddings for the given content hashes."""
+        if not hashes:
+            return {}
+        placeholders = ','.join('?' * len(hashes))
+        with self._lock:
+            rows = self._conn.execute(
+                f"SELECT content_hash, vector FROM embeddings_float32 "
+                f"WHERE deployment = ? AND content_hash IN ({placeholders})",
+                [self.deployment_name, *hashes]
+            ).fetchall()
+        return {content_hash: np.frombuffer(vector, dtype=np.float32) for content_hash, vector in rows}
+    
+    def put_many(self, items: Dict[str, np.ndarray]):
+        """Store embeddings by content hash."""
+        rows = [(content_hash, self.deployment_name, np.asarray(embedding, dtype=np.float32).tobytes())
+                for content_hash, embedding in items.items()]
+        with self._lock:
+            self._conn.executemany("INSERT OR REPLACE INTO embeddings_float32 VALUES (?, ?, ?)", rows)
+            self._conn.commit()
     
-    def get_embeddings_batch(self, texts: List[str]) -> List[List[float]]:
-        """Generate embeddings for multiple texts."""
-        embeddings = []
-        for text in texts:
-            embedding = self.get_embedding(text)
-            embeddings.append(embedding)
-        return embeddings
+    def close(self):
+        with self._lock:
+            self._conn.close()
 
 
 class AzureRAGPipeline:
@@ -586,86 +1187,300 @@ class AzureRAGPipeline:
         search_index_name: str = "financial-documents",
         openai_endpoint: str = None,
         openai_deployment: str = "gpt-4",
-        embedding_deployment: str = "text-embedding-ada-002"
+        embedding_deployment: str = "text-embedding-ada-002",
+        quantization: str = "none",
+        chunk_strategy: str = DEFAULT_CHUNK_STRATEGY,
+        embedding_cache_path: Optional[str] = EMBEDDING_CACHE_PATH,
+        ensure_index: bool = False,
+        compress_uploads: bool = False
     ):
         # Initialize credential manager
         self.credential_manager = AzureCredentialManager()
         
         # Initialize components
-        self.document_processor = DocumentProcessor()
+        self.document_processor = DocumentProcessor(chunk_strategy=chunk_strategy)
         self.search_manager = AzureSearchManager(
-            search_service_name, search_index_name, self.credential_manager
+            search_service_name, search_index_name, self.credential_manager, quantization, compress_uploads
         )
         self.embedding_service = EmbeddingService(
             self.credential_manager, embedding_deployment
         )
         self.openai_client = self.credential_manager.get_openai_client()
         self.openai_deployment = openai_deployment
+        # Routes repeated prompts to the same prompt cache; needs an API version that accepts it
+        self.prompt_cache_key = os.getenv('AZURE_OPENAI_PROMPT_CACHE_KEY')
+        # Skips re-embedding unchanged chunks when a corpus is ingested again
+        self.embedding_cache = (
+            EmbeddingCache(embedding_cache_path, embedding_deployment) if embedding_cache_path else None
+        )
         
-        # Create index if it doesn't exist
-        self.search_manager.create_index()
+        # Queries don't need the index management round-trip; ingestion ensures the index itself
+        if ensure_index:
+            self.search_manager.ensure_index()
     
     def process_directory(self, directory_path: str) -> Dict[str, Any]:
-        """Process all files in a directory."""
-        directory = Path(directory_path)
-        if not directory.exists():
+        """Process all files in a directory through the overlapped parse/embed/upload pipeline."""
+        return self.process_directory_streaming(directory_path)
+    
+    def process_directory_streaming(
+        self,
+        directory_path: str,
+        parse_workers: Optional[int] = None,
+        embed_batch_size: int = 16,
+        embed_concurrency: int = 8,
+        upload_batch_size: int = _UPLOAD_BATCH_SIZE,
+        progress_callback=None
+    ) -> Dict[str, Any]:
+        """
+        Process all files in a directory with overlapped parse, embed and upload stages.
+        
+        Args:
+            directory_path: Directory containing HTML filings
+            parse_workers: Processes used to parse and chunk files (default: CPU count)
+            embed_batch_size: Chunks sent per Azure OpenAI embedding request
+            embed_concurrency: Embedding requests in flight at once
+            upload_batch_size: Documents handed to the Azure Search sender at a time
+            progress_callback: Optional callable receiving the running stats after each upload
+            
+        Returns:
+            Same summary dictionary as process_directory
+        """
+        if not os.path.isdir(directory_path):
             return {"error": f"Directory {directory_path} does not exist"}
         
-        html_files = list(directory.glob("*.htm")) + list(directory.glob("*.html"))
+        html_files = find_html_files(directory_path)
         
         if not html_files:
             return {"error": f"No HTML files found in {directory_path}"}
         
-        total_chunks = 0
-        processed_files = 0
-        uploaded_documents = 0
+        return self.process_files(
+            html_files,
+            parse_workers=parse_workers,
+            embed_batch_size=embed_batch_size,
+            embed_concurrency=embed_concurrency,
+            upload_batch_size=upload_batch_size,
+            progress_callback=progress_callback
+        )
+    
+    def process_files(
+        self,
+        html_files: List[str],
+        parse_workers: Optional[int] = None,
+        embed_batch_size: int = 16,
+        embed_concurrency: int = 8,
+        upload_batch_size: int = _UPLOAD_BATCH_SIZE,
+        progress_callback=None
+    ) -> Dict[str, Any]:
+        """
+        Process an explicit list of files with overlapped parse, embed and upload stages.
         
-        for file_path in html_files:
-            logger.info(f"Processing file: {file_path}")
-            
-            # Process file into chunks
-            chunks = self.document_processor.process_file(file_path)
-            
-            if chunks:
-                # Generate embeddings and prepare documents for upload
-                documents = []
-                for chunk in chunks:
-                    embedding = self.embedding_service.get_embedding(chunk['text'])
-                    
-                    document = {
-                        'id': chunk['id'],
-                        'content': chunk['text'],
-                        'vector': embedding,
-                        'company': chunk['metadata'].get('company'),
-                        'year': chunk['metadata'].get('year'),
-                        'filing_type': chunk['metadata'].get('filing_type'),
-                        'chunk_id': chunk['metadata'].get('chunk_id'),
-                        'token_count': chunk['metadata'].get('token_count'),
-                        'processed_date': chunk['metadata'].get('processed_date')
-                    }
-                    documents.append(document)
-                
-                # Upload to Azure Search
-                uploaded = self.search_manager.upload_documents(documents)
-                uploaded_documents += uploaded
-                total_chunks += len(chunks)
-                processed_files += 1
+        Files are parsed and chunked on a process pool, chunks are embedded in
+        concurrent batched requests on a thread pool, and documents are queued
+        from the calling thread on the Azure Search buffered sender, so the slowest stage bounds throughput instead
+        of the sum of all.
         
-        return {
+        Args:
+            html_files: Paths of the HTML filings to process
+            parse_workers: Processes used to parse and chunk files (default: CPU count)
+            embed_batch_size: Chunks sent per Azure OpenAI embedding request
+            embed_concurrency: Embedding requests in flight at once
+            upload_batch_size: Documents handed to the Azure Search sender at a time
+            progress_callback: Optional callable receiving the running stats after each upload
+            
+        Returns:
+            Same summary dictionary as process_directory
+        """
+        stats = {
             'total_files': len(html_files),
-            'processed_files': processed_files,
-            'total_chunks': total_chunks,
-            'search_documents': uploaded_documents
+            'processed_files': 0,
+            'total_chunks': 0,
+            'failed_chunks': 0,
+            'search_documents': 0
         }
+        # Done-callbacks of the embedding pool update the failure count from worker threads
+        stats_lock = threading.Lock()
+        self.search_manager.ensure_index()
+        # Bounded queues keep a fast stage from buffering a whole directory; the
+        # embedded queue holds whole embedding batches, about two uploads' worth
+        chunk_queue = queue.Queue(maxsize=embed_batch_size * 8)
+        embedded_queue = queue.Queue(maxsize=max(2, upload_batch_size * 2 // embed_batch_size))
+        
+        def parse_stage():
+            try:
+                # HTML parsing is CPU-bound pure Python, so it runs outside the GIL in worker processes
+                parse = partial(
+                    _parse_and_chunk,
+                    chunk_size=self.document_processor.chunk_size,
+                    chunk_strategy=self.document_processor.chunk_strategy,
+                    # One timestamp for the whole run
+                    processed_date=_utc_timestamp()
+                )
+                with ProcessPoolExecutor(max_workers=parse_workers) as pool:
+                    # Files are handed on as they finish, so one large filing doesn't hold back the rest
+                    for future in as_completed([pool.submit(parse, file_path) for file_path in html_files]):
+                        chunks = future.result()
+                        if chunks:
+                            stats['processed_files'] += 1
+                            stats['total_chunks'] += len(chunks)
+                        # Chunks travel as (file batch, index) so metadata is never copied per chunk
+                        for index in range(len(chunks)):
+                            chunk_queue.put((chunks, index))
+            finally:
+                chunk_queue.put(_STREAM_DONE)
+        
+        def embed_batch(batch):
+            hashes = [chunks.content_hashes[index] for chunks, index in batch]
+            cached = self.embedding_cache.get_many(hashes) if self.embedding_cache else {}
+            misses = [(chunks, index) for (chunks, index), content_hash in zip(batch, hashes)
+                      if content_hash not in cached]
+            if misses:
+                embeddings = self.embedding_service.get_embeddings_batch(
+                    [chunks.texts[index] for chunks, index in misses],
+                    [int(chunks.token_counts[index]) for chunks, index in misses]
+                )
+                # Zero vectors are failed requests and must not be cached
+                fresh = {chunks.content_hashes[index]: embedding
+                         for (chunks, index), embedding in zip(misses, embeddings) if embedding.any()}
+                if self.embedding_cache and fresh:
+                    self.embedding_cache.put_many(fresh)
+                for (chunks, index), embedding in zip(misses, embeddings):
+                    cached.setdefault(chunks.content_hashes[index], embedding)
+            vectors = np.stack([cached[content_hash] for content_hash in hashes])
+            # Zero rows are chunks whose embedding request failed; no vector query can rank them
+            embedded = vectors.any(axis=1)
+            if not embedded.all():
+                failed = len(batch) - int(embedded.sum())
+                logger.error(f"Dropping {failed} chunks whose embedding requests failed")
+                with stats_lock:
+                    stats['failed_chunks'] += failed
+                batch = [row for row, ok in zip(batch, embedded) if ok]
+                vectors = vectors[embedded]
+            # Rows stay as (chunk batch, index) references; documents are built at upload time
+            if batch:
+                embedded_queue.put((batch, vectors))
+        
+        def embed_stage():
+            # Caps queued plus running requests so chunks are not drained faster than they embed
+            in_flight = threading.BoundedSemaphore(embed_concurrency)
+            
+            def on_done(batch, future):
+                in_flight.release()
+                error = future.exception()
+                if error is not None:
+                    # The batch never reaches the upload queue, so its chunks are dropped
+                    logger.error(f"Embedding batch of {len(batch)} chunks failed: {error!r}")
+                    with stats_lock:
+                        stats['failed_chunks'] += len(batch)
+            
+            def submit(pool, batch):
+                in_flight.acquire()
+                pool.submit(embed_batch, batch).add_done_callback(partial(on_done, batch))
+            
+            batch = []
+            try:
+                with ThreadPoolExecutor(max_workers=embed_concurrency) as pool:
+                    while True:
+                        chunk = chunk_queue.get()
+                        if chunk is _STREAM_DONE:
+                            break
+                        batch.append(chunk)
+                        if len(batch) >= embed_batch_size:
+                            submit(pool, batch)
+                            batch = []
+                    if batch:
+                        submit(pool, batch)
+            finally:
+                embedded_queue.put(_STREAM_DONE)
+        
+        def upload(documents):
+            self.search_manager.queue_documents(documents)
+            stats['search_documents'] = self.search_manager.queued_uploaded_count
+            if progress_callback:
+                progress_callback(stats)
+        
+        stages = [
+            threading.Thread(target=parse_stage, name="rag-parse", daemon=True),
+            threading.Thread(target=embed_stage, name="rag-embed", daemon=True)
+        ]
+        for stage in stages:
+            stage.start()
+        
+        rows = []
+        vectors = []
+        try:
+            while True:
+                embedded = embedded_queue.get()
+                if embedded is _STREAM_DONE:
+                    break
+                rows.extend(embedded[0])
+                vectors.append(embedded[1])
+                if len(rows) >= upload_batch_size:
+                    upload(self._to_documents(rows, np.concatenate(vectors)))
+                    rows = []
+                    vectors = []
+            if rows:
+                upload(self._to_documents(rows, np.concatenate(vectors)))
+            
+            for stage in stages:
+                stage.join()
+        finally:
+            # Flush whatever the sender has buffered even if ingestion is interrupted
+            stats['search_documents'] = self.search_manager.close_buffered_sender()
+        return stats
+    
+    @staticmethod
+    def _to_documents(rows: List[Tuple[ChunkBatch, int]], vectors: np.ndarray) -> List[Dict[str, Any]]:
+        """Build Azure Search documents for (chunk batch, index) rows and their stacked embeddings."""
+        # One tolist() for the whole matrix yields the JSON-ready vectors, so the
+        # documents need no second, per-document conversion copy
+        return [
+            {
+                'id': chunks.document_id(index),
+                'content': chunks.texts[index],
+                'vector': vector,
+                'company': chunks.file_metadata.get('company'),
+                'year': chunks.file_metadata.get('year'),
+                'filing_type': chunks.file_metadata.get('filing_type'),
+                'chunk_id': int(chunks.chunk_ids[index]),
+                'token_count': int(chunks.token_counts[index]),
+                'processed_date': chunks.file_metadata.get('processed_date')
+            }
+            for (chunks, index), vector in zip(rows, vectors.tolist())
+        ]
     
-    def query(self, query_text: str, top_k: int = 5, return_json: bool = False) -> Dict[str, Any]:
-        """Query the RAG system."""
+    def query(self, query_text: str, top_k: int = 5, return_json: bool = False,
+              return_format: Optional[str] = None, max_tokens: int = _ANSWER_MAX_TOKENS):
+        """
+        Query the RAG system.
+        
+        return_format selects the structured (return_json) result as a 'dict',
+        a 'json' string or 'orjson' bytes; None keeps the return_json behaviour.
+        'stream' returns the same dict with 'answer' as an iterator of text
+        deltas, so the first tokens can be shown before the answer completes.
+        max_tokens caps the generated answer.
+        """
+        if return_format is None:
+            return self._query(query_text, top_k, return_json, max_tokens)
+        if return_format == 'stream':
+            return self._query_stream(query_text, top_k, max_tokens)
+        
+        result = self._query(query_text, top_k, True, max_tokens)
+        if return_format == 'dict':
+            return result
+        if return_format == 'orjson' and ORJSON_AVAILABLE:
+            return orjson.dumps(result, option=orjson.OPT_SERIALIZE_NUMPY)
+        if return_format in ('json', 'orjson'):
+            return json.dumps(result)
+        raise ValueError(f"Unknown return format: {return_format}")
+    
+    def _query(self, query_text: str, top_k: int, return_json: bool,
+               max_tokens: int = _ANSWER_MAX_TOKENS) -> Dict[str, Any]:
         try:
             # Generate query embedding
-            query_embedding = self.embedding_service.get_embedding(query_text)
+            query_embedding = self.embedding_service.get_query_embedding(query_text)
             
             # Search Azure AI Search
-            search_results = self.search_manager.search(query_embedding, top_k)
+            search_results = self.search_manager.search(query_embedding, top_k, query_text=query_text)
             
             if not search_results:
                 if return_json:
@@ -678,27 +1493,9 @@ class AzureRAGPipeline:
                 else:
                     return {"error": "No relevant information found"}
             
-            # Prepare context for LLM
-            context = "\n\n".join([
-                f"Document {i+1} (Company: {result['metadata'].get('company', 'Unknown')}, Year: {result['metadata'].get('year', 'Unknown')}):\n{result['content']}"
-                for i, result in enumerate(search_results)
-            ])
-            
             # Generate answer using Azure OpenAI
-            system_prompt = """You are a financial analyst expert. Use the provided context to answer questions about financial documents. 
-            Provide specific, accurate answers based on the context. If the information is not in the context, say so clearly.
-            Always cite which company and year you're referencing."""
-            
             try:
-                response = self.openai_client.chat.completions.create(
-                    model=self.openai_deployment,
-                    messages=[
-                        {"role": "system", "content": system_prompt},
-                        {"role": "user", "content": f"Context:\n{context}\n\nQuestion: {query_text}"}
-                    ],
-                    max_tokens=1000,
-                    temperature=0.1
-                )
+                response = self._create_completion(query_text, search_results, max_tokens=max_tokens)
                 
                 answer = response.choices[0].message.content
                 
@@ -707,15 +1504,7 @@ class AzureRAGPipeline:
                         "query": query_text,
                         "answer": answer,
                         "confidence": max(result['score'] for result in search_results),
-                        "sources": [
-                            {
-                                "company": result['metadata'].get('company'),
-                                "year": result['metadata'].get('year'),
-                                "excerpt": result['content'][:200] + "...",
-                                "score": result['score']
-                            }
-                            for result in search_results
-                        ]
+                        "sources": self._sources(search_results)
                     }
                 else:
                     return {
@@ -746,9 +1535,106 @@ class AzureRAGPipeline:
             logger.error(f"Error in query processing: {e}")
             return {"error": str(e)}
     
+    def _query_stream(self, query_text: str, top_k: int, max_tokens: int = _ANSWER_MAX_TOKENS) -> Dict[str, Any]:
+        try:
+            query_embedding = self.embedding_service.get_query_embedding(query_text)
+            search_results = self.search_manager.search(query_embedding, top_k, query_text=query_text)
+            
+            if not search_results:
+                return {
+                    "query": query_text,
+                    "answer": iter(["No relevant information found."]),
+                    "confidence": 0.0,
+                    "sources": []
+                }
+            
+            response = self._create_completion(query_text, search_results, stream=True, max_tokens=max_tokens)
+        except Exception as e:
+            logger.error(f"Error in query processing: {e}")
+            return {"error": str(e)}
+        
+        def answer_deltas():
+            for chunk in response:
+                # Azure sends content-filter results in chunks without choices
+                if chunk.choices and chunk.choices[0].delta.content:
+                    yield chunk.choices[0].delta.content
+        
+        return {
+            "query": query_text,
+            "answer": answer_deltas(),
+            "confidence": max(result['score'] for result in search_results),
+            "sources": self._sources(search_results)
+        }
+    
+    def _create_completion(self, query_text: str, search_results: List[Dict[str, Any]], stream: bool = False,
+                           max_tokens: int = _ANSWER_MAX_TOKENS):
+        """Ask the chat deployment to answer query_text from the retrieved search results."""
+        context = self._build_context(search_results)
+        options = {}
+        if self.prompt_cache_key:
+            options['extra_body'] = {"prompt_cache_key": self.prompt_cache_key}
+        return self.openai_client.chat.completions.create(
+            model=self.openai_deployment,
+            messages=[
+                {"role": "system", "content": _SYSTEM_PROMPT},
+                {"role": "user", "content": f"Context:\n{context}\n\nQuestion: {query_text}"}
+            ],
+            max_tokens=max_tokens,
+            temperature=0.1,
+            stream=stream,
+            **options
+        )
+    
+    @staticmethod
+    def _build_context(search_results: List[Dict[str, Any]]) -> str:
+        """Join the highest-scored results into the prompt context, within _CONTEXT_TOKEN_BUDGET tokens."""
+        ranked = sorted(search_results, key=lambda result: result['score'], reverse=True)
+        documents = [
+            f"Document {i+1} (Company: {result['metadata'].get('company', 'Unknown')}, Year: {result['metadata'].get('year', 'Unknown')}):\n{result['content']}"
+            for i, result in enumerate(ranked)
+        ]
+        encoding = _get_encoding()
+        context = []
+        remaining = _CONTEXT_TOKEN_BUDGET
+        for document, tokens in zip(documents, encoding.encode_ordinary_batch(documents)):
+            if len(tokens) > remaining:
+                # Keep the start of the marginal document instead of dropping it entirely
+                if remaining > 0:
+                    context.append(encoding.decode(tokens[:remaining]))
+                break
+            context.append(document)
+            # One more token for the blank line joining documents
+            remaining -= len(tokens) + 1
+        return "\n\n".join(context)
+    
+    @staticmethod
+    def _sources(search_results: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        return [
+            {
+                "company": result['metadata'].get('company'),
+                "year": result['metadata'].get('year'),
+                "excerpt": result['content'][:200] + "...",
+                "score": result['score']
+            }
+            for result in search_results
+        ]
+    
     def get_stats(self) -> Dict[str, Any]:
         """Get system statistics."""
         return self.search_manager.get_stats()
+    
+    def prefetch_queries(self, queries: List[str]):
+        """Embed likely queries ahead of time so they are served from the query-embedding cache."""
+        for query_text in queries:
+            self.embedding_service.get_query_embedding(query_text)
+    
+    def warmup(self):
+        """Open the Azure Search and Azure OpenAI connections ahead of the first query."""
+        try:
+            self.search_manager.search_client.get_document_count()
+        except Exception as e:
+            logger.debug(f"Search warmup failed: {e}")
+        self.embedding_service.warmup()
 
 
 if __name__ == "__main__":
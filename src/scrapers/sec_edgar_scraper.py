@@ -14,14 +14,20 @@ Features:
 """
 
 import os
-from bs4 import BeautifulSoup
+import asyncio
 import time
+import random
+import threading
 import requests
+from requests.adapters import HTTPAdapter
 import logging
 from pathlib import Path
-from typing import List, Dict, Optional
+from typing import AsyncIterator, List, Dict, Iterable, Iterator, Optional, Tuple
 from datetime import datetime
 import json
+import sqlite3
+import zlib
+from concurrent.futures import ThreadPoolExecutor, as_completed, wait
 from azure.storage.blob import BlobServiceClient
 
 # Azure Storage (optional)
@@ -32,9 +38,169 @@ try:
 except ImportError:
     AZURE_STORAGE_AVAILABLE = False
 
+# Async HTTP client and token-bucket rate limiter (optional)
+try:
+    import httpx
+    from aiolimiter import AsyncLimiter
+    ASYNC_SCRAPER_AVAILABLE = True
+except ImportError:
+    ASYNC_SCRAPER_AVAILABLE = False
+
+# HTTP/2 lets concurrent requests share one multiplexed connection (needs httpx[http2])
+try:
+    import h2  # noqa: F401
+    HTTP2_AVAILABLE = True
+except ImportError:
+    HTTP2_AVAILABLE = False
+
+# SEC fair-access policy: at most 10 requests per second across all connections
+SEC_MAX_REQUESTS_PER_SECOND = 10
+
+# Upper bound on companies scraped in parallel by scrape_all_companies
+_MAX_COMPANY_WORKERS = 8
+
+# Background threads uploading saved filings to Azure Blob Storage
+_UPLOAD_WORKERS = 4
+
+# Container that filings are mirrored to when AZURE_STORAGE_CONNECTION_STRING is set
+_FILINGS_CONTAINER = "filings"
+
+# Threads writing and uploading demo filings in create_demo_filings
+_DEMO_FILING_WORKERS = 8
+
+# Read size when streaming filing documents to disk
+_DOWNLOAD_CHUNK_SIZE = 65536
+
+# On-disk cache of SEC response bodies, revalidated with ETag/Last-Modified
+_HTTP_CACHE_PATH = str(Path.home() / '.cache' / 'edgar_cache.db')
+
+# Cached submissions JSON younger than this is served without revalidation
+_SUBMISSIONS_MAX_AGE = 24 * 60 * 60
+
+# Decorrelated-jitter retry backoff bounds, in seconds
+_RETRY_BASE_DELAY = 1.0
+_RETRY_MAX_DELAY = 30.0
+
 logger = logging.getLogger(__name__)
 
 
+def _retry_delay(previous: float, response=None) -> float:
+    """Next backoff delay; honors Retry-After on 429/503, else decorrelated jitter."""
+    if response is not None and response.status_code in (429, 503):
+        retry_after = response.headers.get('Retry-After', '')
+        if retry_after.isdigit():
+            return min(_RETRY_MAX_DELAY, float(retry_after))
+    return min(_RETRY_MAX_DELAY, random.uniform(_RETRY_BASE_DELAY, previous * 3))
+
+
+def _is_fresh(url: str, fetched_at: float, max_age: float) -> bool:
+    """Archive documents never change; other cache entries are fresh for max_age seconds."""
+    return '/Archives/' in url or time.time() - fetched_at < max_age
+
+
+def _revalidation_headers(cached: Optional[Tuple[Optional[str], Optional[str], bytes, float]]) -> Dict[str, str]:
+    """Conditional request headers for a cached (etag, last_modified, body, fetched_at) entry."""
+    headers = {}
+    if cached:
+        etag, last_modified = cached[:2]
+        if etag:
+            headers['If-None-Match'] = etag
+        if last_modified:
+            headers['If-Modified-Since'] = last_modified
+    return headers
+
+
+def _cached_response(url: str, body: bytes) -> requests.Response:
+    """Wrap a cached body in a 200 response for callers of _make_request."""
+    response = requests.Response()
+    response.status_code = 200
+    response.url = url
+    response._content = body
+    return response
+
+
+def _iter_from_thread(chunks: AsyncIterator[bytes], loop: asyncio.AbstractEventLoop) -> Iterator[bytes]:
+    """Consume an async byte stream from a worker thread, one chunk per hop onto the loop."""
+    iterator = chunks.__aiter__()
+    
+    async def next_chunk() -> bytes:
+        return await iterator.__anext__()
+    
+    while True:
+        try:
+            yield asyncio.run_coroutine_threadsafe(next_chunk(), loop).result()
+        except StopAsyncIteration:
+            return
+
+
+class _HTTPCache:
+    """Thread-safe SQLite store of zlib-compressed SEC response bodies keyed by URL."""
+    
+    def __init__(self, path: str):
+        Path(path).parent.mkdir(parents=True, exist_ok=True)
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._lock = threading.Lock()
+        with self._lock:
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS http_cache(url TEXT PRIMARY KEY, etag TEXT, "
+                "last_modified TEXT, body BLOB, status INT, fetched_at REAL)"
+            )
+            self._conn.commit()
+    
+    def get(self, url: str) -> Optional[Tuple[Optional[str], Optional[str], bytes, float]]:
+        """Return (etag, last_modified, body, fetched_at) for a cached URL, or None."""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT etag, last_modified, body, fetched_at FROM http_cache WHERE url=?", (url,)
+            ).fetchone()
+        if row is None:
+            return None
+        etag, last_modified, body, fetched_at = row
+        return etag, last_modified, zlib.decompress(body), fetched_at
+    
+    def touch(self, url: str):
+        """Mark a cached entry as just revalidated."""
+        with self._lock:
+            self._conn.execute("UPDATE http_cache SET fetched_at=? WHERE url=?", (time.time(), url))
+            self._conn.commit()
+    
+    def put(self, url: str, response):
+        """Store a 200 response (requests or httpx) along with its validators."""
+        body = zlib.compress(response.content)
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO http_cache VALUES (?, ?, ?, ?, ?, ?)",
+                (url, response.headers.get('ETag'), response.headers.get('Last-Modified'),
+                 body, response.status_code, time.time())
+            )
+            self._conn.commit()
+
+
+class _TokenBucket:
+    """Thread-safe token bucket pacing blocking requests to a steady rate."""
+    
+    def __init__(self, rate: float = SEC_MAX_REQUESTS_PER_SECOND,
+                 capacity: float = SEC_MAX_REQUESTS_PER_SECOND):
+        self.rate = rate
+        self.capacity = capacity
+        self.tokens = capacity
+        self.last_refill = time.monotonic()
+        self._lock = threading.Lock()
+    
+    def acquire(self):
+        """Take one token, sleeping until the bucket has refilled enough."""
+        with self._lock:
+            now = time.monotonic()
+            self.tokens = min(self.capacity, self.tokens + (now - self.last_refill) * self.rate)
+            self.last_refill = now
+            # Reserve the token now so waiting threads queue up behind each other
+            self.tokens -= 1
+            wait = -self.tokens / self.rate if self.tokens < 0 else 0.0
+        if wait:
+            time.sleep(wait)
+
+
 class SECEdgarScraper:
     """
     SEC EDGAR scraper for downloading 10-K filings.
@@ -60,7 +226,8 @@ class SECEdgarScraper:
     
     def __init__(self, user_agent: str = "Azure Financial Analysis Tool 1.0", 
                  azure_storage_connection: Optional[str] = None,
-                 azure_container_name: str = "financial-filings"):
+                 azure_container_name: str = "financial-filings",
+                 http_cache_path: Optional[str] = _HTTP_CACHE_PATH):
         """
         Initialize the scraper.
         
@@ -68,6 +235,7 @@ class SECEdgarScraper:
             user_agent: User agent string for SEC requests
             azure_storage_connection: Azure Storage connection string (optional)
             azure_container_name: Azure container name for blob storage
+            http_cache_path: SQLite response cache location (None disables caching)
         """
         self.user_agent = user_agent
         # Use the class-level COMPANIES but allow for dynamic updates
@@ -80,12 +248,36 @@ class SECEdgarScraper:
             'Accept-Encoding': 'gzip, deflate',
             'Connection': 'keep-alive'
         }
+        # One pooled session reuses TLS connections to data.sec.gov and www.sec.gov
+        self.session = requests.Session()
+        self.session.headers.update(self.headers)
+        self.session.mount("https://", HTTPAdapter(
+            pool_connections=2, pool_maxsize=SEC_MAX_REQUESTS_PER_SECOND
+        ))
+        # Paces blocking requests just under SEC's 10 req/s ceiling; a single-token
+        # burst keeps any one-second window under the ceiling too
+        self._bucket = _TokenBucket(rate=SEC_MAX_REQUESTS_PER_SECOND * 0.95, capacity=1)
+        # Parsed submissions JSON by CIK
+        self._submissions: Dict[str, Dict] = {}
+        self._http_cache = None
+        if http_cache_path:
+            try:
+                self._http_cache = _HTTPCache(http_cache_path)
+            except (OSError, sqlite3.Error) as e:
+                logger.warning(f"HTTP cache disabled, could not open {http_cache_path}: {e}")
 
         # Azure Storage setup (optional)
         load_dotenv()
         self.azure_storage_connection = os.getenv("AZURE_STORAGE_CONNECTION_STRING")
         self.azure_container_name = azure_container_name
         self.blob_service_client = None
+        self._filings_container_client = None
+        self._filings_container_lock = threading.Lock()
+        # Blob uploads run in the background, overlapping the next download
+        self._upload_pool = ThreadPoolExecutor(max_workers=_UPLOAD_WORKERS)
+        self._upload_futures = []
+        # Cleared once Azure fails to fetch a document from SEC itself
+        self._server_side_copy = True
         
         if azure_storage_connection and AZURE_STORAGE_AVAILABLE:
             try:
@@ -144,31 +336,44 @@ class SECEdgarScraper:
                 else:
                     logger.error(f"Error creating container: {e}")
     
-    def _make_request(self, url: str, retries: int = 3) -> Optional[requests.Response]:
+    def _make_request(self, url: str, retries: int = 3, stream: bool = False,
+                      max_age: float = 0) -> Optional[requests.Response]:
         """
         Make a rate-limited request to SEC with retry logic.
         
         Args:
             url: The URL to request
             retries: Number of retry attempts
+            stream: Leave the body unread for iter_content; bypasses the HTTP cache
+            max_age: Seconds a cached response is served without revalidation
             
         Returns:
             Response object or None if failed
         """
+        cached = self._http_cache.get(url) if self._http_cache and not stream else None
+        if cached and _is_fresh(url, cached[3], max_age):
+            return _cached_response(url, cached[2])
+        headers = _revalidation_headers(cached)
+        
+        delay = _RETRY_BASE_DELAY
         for attempt in range(retries):
             try:
-                # SEC rate limiting: 10 requests per second max
-                time.sleep(0.1)  # 100ms delay
-                
-                response = requests.get(url, headers=self.headers, timeout=30)
+                self._bucket.acquire()
+                response = self.session.get(url, headers=headers, timeout=30, stream=stream)
+                if response.status_code == 304 and cached:
+                    self._http_cache.touch(url)
+                    return _cached_response(url, cached[2])
                 response.raise_for_status()
                 
+                if self._http_cache and not stream:
+                    self._http_cache.put(url, response)
                 return response
                 
             except requests.exceptions.RequestException as e:
                 logger.warning(f"Request attempt {attempt + 1} failed for {url}: {e}")
                 if attempt < retries - 1:
-                    time.sleep(2 ** attempt)  # Exponential backoff
+                    delay = _retry_delay(delay, e.response)
+                    time.sleep(delay)
                 else:
                     logger.error(f"All retry attempts failed for {url}")
                     return None
@@ -188,21 +393,35 @@ class SECEdgarScraper:
             return None
         
         cik = self.companies[company_symbol]['cik']
-        url = f"https://data.sec.gov/submissions/CIK{cik.zfill(10)}.json"
-        
         logger.info(f"Fetching filing data for {company_symbol} (CIK: {cik})")
         
-        response = self._make_request(url)
+        data = self._cached_submissions(cik)
+        if data is not None:
+            logger.info(f"Retrieved filing data for {company_symbol}")
+        return data
+    
+    def _cached_submissions(self, cik: str) -> Optional[Dict]:
+        """
+        Parsed submissions JSON for a CIK, memoized for the scraper's lifetime.
+        
+        Behind the in-process memo, the HTTP cache serves a copy fetched in the
+        last 24 hours without touching the network.
+        """
+        if cik in self._submissions:
+            return self._submissions[cik]
+        
+        url = f"https://data.sec.gov/submissions/CIK{cik.zfill(10)}.json"
+        response = self._make_request(url, max_age=_SUBMISSIONS_MAX_AGE)
         if not response:
             return None
         
         try:
             data = response.json()
-            logger.info(f"Retrieved filing data for {company_symbol}")
-            return data
         except json.JSONDecodeError as e:
-            logger.error(f"Failed to parse JSON response for {company_symbol}: {e}")
+            logger.error(f"Failed to parse JSON response for CIK {cik}: {e}")
             return None
+        self._submissions[cik] = data
+        return data
     
     def find_10k_filings(self, filings_data: Dict, years: List[int]) -> List[Dict]:
         """
@@ -219,21 +438,30 @@ class SECEdgarScraper:
         forms = recent_filings.get('form', [])
         filing_dates = recent_filings.get('filingDate', [])
         accession_numbers = recent_filings.get('accessionNumber', [])
+        primary_documents = recent_filings.get('primaryDocument', [])
+        years_set = frozenset(years)
         
         found_filings = []
         
-        for i, form in enumerate(forms):
-            if form == '10-K' and i < len(filing_dates) and i < len(accession_numbers):
-                filing_date = filing_dates[i]
-                filing_year = int(filing_date.split('-')[0])
-                
-                if filing_year in years:
-                    found_filings.append({
-                        'form': form,
-                        'filing_date': filing_date,
-                        'year': filing_year,
-                        'accession_number': accession_numbers[i]
-                    })
+        # list.index scans in C, so only the (rare) 10-K rows are visited in Python
+        count = min(len(forms), len(filing_dates), len(accession_numbers))
+        i = -1
+        while True:
+            try:
+                i = forms.index('10-K', i + 1, count)
+            except ValueError:
+                break
+            filing_date = filing_dates[i]
+            filing_year = int(filing_date[:4])
+            
+            if filing_year in years_set:
+                found_filings.append({
+                    'form': '10-K',
+                    'filing_date': filing_date,
+                    'year': filing_year,
+                    'accession_number': accession_numbers[i],
+                    'primary_document': primary_documents[i] if i < len(primary_documents) else None
+                })
         
         # Sort by year
         found_filings.sort(key=lambda x: x['year'])
@@ -241,9 +469,9 @@ class SECEdgarScraper:
         logger.info(f"Found {len(found_filings)} 10-K filings for years {years}")
         return found_filings
     
-    def download_filing(self, company_symbol: str, filing: Dict, output_dir: str) -> Optional[str]:
+    def download_filing(self, company_symbol: str, filing: Dict, output_dir: str) -> Optional[Tuple[str, int]]:
         """
-        Download a specific 10-K filing.
+        Download a specific 10-K filing, reusing a copy saved by an earlier run.
         
         Args:
             company_symbol: Company symbol
@@ -251,85 +479,159 @@ class SECEdgarScraper:
             output_dir: Output directory for local storage
             
         Returns:
-            Local file path if successful, None otherwise
+            (local file path, size in bytes) if successful, None otherwise
         """
+        existing = self._existing_filing(company_symbol, filing, output_dir)
+        if existing:
+            return existing
+        
         cik = self.companies[company_symbol]['cik']
         accession_number = filing['accession_number']
         accession_clean = accession_number.replace('-', '')
         year = filing['year']
         # Construct base filing URL
         base_url = f"https://www.sec.gov/Archives/edgar/data/{cik}/{accession_clean}"
-        # Try to get the index page to find the actual 10-K document
-        index_url = f"{base_url}/{accession_number}-index.htm"
-        logger.info(f"Downloading 10-K filing for {company_symbol} {year} (index page2: {index_url})")
-        response = self._make_request(index_url)
-        logger.info('made request')
-        if not response:
-            logger.error(f"Failed to fetch index page: {index_url}")
-            return None
-        # Parse the index page to find the 10-K document
-        soup = BeautifulSoup(response.content, 'html.parser')
-        document_link = None
-        for link in soup.find_all('a', href=True):
-            href = link['href']
-            if href.endswith('.htm') and '10-k' in href.lower():
-                document_link = href
-                break
-        if not document_link:
-            # Fallback: try primary document from SEC JSON if available
-            document_link = filing.get('primary_document')
-        if not document_link:
-            # Fallback: try common naming pattern
-            document_link = f"{accession_number}.txt"
-        # Download the actual document
+        document_link = filing.get('primary_document')
+        if document_link:
+            logger.info(f"Downloading 10-K filing for {company_symbol} {year} ({document_link})")
+        else:
+            # The directory listing names the filing's actual documents
+            index_url = f"{base_url}/index.json"
+            logger.info(f"Downloading 10-K filing for {company_symbol} {year} (index: {index_url})")
+            response = self._make_request(index_url)
+            if not response:
+                logger.error(f"Failed to fetch filing index: {index_url}")
+                return None
+            try:
+                index_data = response.json()
+            except ValueError as e:
+                logger.error(f"Failed to parse filing index {index_url}: {e}")
+                return None
+            document_link = self._find_document_link(index_data, filing)
         document_url = f"{base_url}/{document_link}"
-        doc_response = self._make_request(document_url)
+        doc_response = self._make_request(document_url, stream=True)
         if not doc_response:
             logger.error(f"Failed to download document: {document_url}")
             return None
+        with doc_response:
+            downloaded = self._save_filing(
+                company_symbol, filing, doc_response.iter_content(_DOWNLOAD_CHUNK_SIZE), output_dir
+            )
+        if downloaded:
+            self._queue_upload(downloaded[0], document_url)
+        return downloaded
+    
+    def _find_document_link(self, index_data: Dict, filing: Dict) -> str:
+        """
+        Find the 10-K document in a filing's index.json directory listing.
+        
+        Args:
+            index_data: Parsed index.json of the filing directory
+            filing: Filing information dictionary
+            
+        Returns:
+            Document path relative to the filing base URL
+        """
+        # R*.htm files are XBRL viewer fragments, not filing documents
+        documents = [
+            item for item in index_data.get('directory', {}).get('item', [])
+            if item.get('name', '').endswith('.htm') and not item['name'].startswith('R')
+        ]
+        document_link = next(
+            (item['name'] for item in documents if '10-k' in item['name'].lower()), None
+        )
+        if not document_link and documents:
+            # The main document dwarfs the exhibits filed alongside it
+            document_link = max(
+                documents, key=lambda item: int(item['size']) if str(item.get('size', '')).isdigit() else 0
+            )['name']
+        if not document_link:
+            # Fallback: try common naming pattern
+            document_link = f"{filing['accession_number']}.txt"
+        return document_link
+    
+    @staticmethod
+    def _filing_path(company_symbol: str, filing: Dict, output_dir: str) -> str:
+        """Local path a filing is saved to."""
+        return os.path.join(
+            output_dir, f"{company_symbol}_10K_{filing['year']}_{filing['accession_number']}.htm"
+        )
+    
+    def _existing_filing(self, company_symbol: str, filing: Dict,
+                         output_dir: str) -> Optional[Tuple[str, int]]:
+        """(path, size) of a filing already saved by an earlier run, or None."""
+        local_file_path = self._filing_path(company_symbol, filing, output_dir)
+        try:
+            file_size = os.path.getsize(local_file_path)
+        except OSError:
+            return None
+        if not file_size:
+            return None
+        logger.info(f"Skipping {os.path.basename(local_file_path)}, already downloaded")
+        return local_file_path, file_size
+    
+    def _save_filing(self, company_symbol: str, filing: Dict, chunks: Iterable[bytes],
+                     output_dir: str) -> Optional[Tuple[str, int]]:
+        """
+        Save a downloaded 10-K document locally.
+        
+        Args:
+            company_symbol: Company symbol
+            filing: Filing information dictionary
+            chunks: Document bytes, written to disk as they arrive
+            output_dir: Output directory for local storage
+            
+        Returns:
+            (local file path, size in bytes) if successful, None otherwise
+        """
         # Create output directory if it doesn't exist
         os.makedirs(output_dir, exist_ok=True)
-        # Generate filename
-        local_filename = f"{company_symbol}_10K_{year}_{accession_number}.htm"
-        local_file_path = os.path.join(output_dir, local_filename)
+        local_file_path = self._filing_path(company_symbol, filing, output_dir)
+        local_filename = os.path.basename(local_file_path)
         # Save the document
+        # Stream into a partial file so an interrupted download never looks complete
+        partial_path = f"{local_file_path}.part"
         try:
-            with open(local_file_path, 'wb') as f:
-                f.write(doc_response.content)
-            file_size = os.path.getsize(local_file_path)
+            file_size = 0
+            with open(partial_path, 'wb') as f:
+                for chunk in chunks:
+                    f.write(chunk)
+                    file_size += len(chunk)
+            os.replace(partial_path, local_file_path)
             logger.info(f"Saved {local_filename} ({file_size:,} bytes)")
-            # Optionally upload to Azure Storage
-            load_dotenv()
-            connection_string = os.getenv("AZURE_STORAGE_CONNECTION_STRING")
-            container_name = "filings"
-            blob_service_client = None
-            container_client = None
-            if connection_string:
-                print("Azure Storage connection string found, initializing client...")
-                blob_service_client = BlobServiceClient.from_connection_string(connection_string)
-                container_client = blob_service_client.get_container_client(container_name)
-                try:
-                    print('Creating container if not exists...')
-                    container_client.create_container()
-                except Exception:
-                    pass  # Container may already exist
-            if container_client:
-                blob_name = os.path.basename(local_file_path)
-                with open(local_file_path, "rb") as data:
-                    container_client.upload_blob(name=blob_name, data=data, overwrite=True)
-                print(f"Uploaded {local_filename} to Azure Blob Storage container '{container_name}'")
-            return local_file_path
+            return local_file_path, file_size
         except Exception as e:
             logger.error(f"Error saving file {local_filename}: {e}")
+            if os.path.exists(partial_path):
+                os.remove(partial_path)
             return None
     
-    def _upload_to_azure_storage(self, filename: str, content: str):
+    def _copy_from_source(self, blob_client, source_url: Optional[str]) -> bool:
+        """
+        Have Azure copy a public SEC document into a blob server-side.
+        
+        Returns False when there is no source URL or the copy fails (for
+        example when SEC rejects Azure's request); after one failure the
+        scraper stops attempting server-side copies.
+        """
+        if not source_url or not self._server_side_copy:
+            return False
+        try:
+            blob_client.upload_blob_from_url(source_url, overwrite=True)
+            return True
+        except Exception as e:
+            logger.info(f"Server-side copy from {source_url} failed, uploading from disk instead: {e}")
+            self._server_side_copy = False
+            return False
+    
+    def _upload_to_azure_storage(self, filename: str, file_path: str, source_url: Optional[str] = None):
         """
-        Upload file content to Azure Blob Storage.
+        Upload a saved filing to Azure Blob Storage.
         
         Args:
             filename: Blob name
-            content: File content as string
+            file_path: Local file, streamed from disk unless the server-side copy succeeds
+            source_url: Public SEC URL of the document to copy from (optional)
         """
         if not self.blob_service_client:
             return
@@ -340,19 +642,71 @@ class SECEdgarScraper:
                 blob=filename
             )
             
-            blob_client.upload_blob(
-                data=content.encode('utf-8'),
-                overwrite=True,
-                content_type='text/html'
-            )
+            if not self._copy_from_source(blob_client, source_url):
+                with open(file_path, "rb") as data:
+                    blob_client.upload_blob(
+                        data=data,
+                        overwrite=True,
+                        content_type='text/html'
+                    )
             
-            logger.info(f"Uploaded to Azure Storage: {filename}")
+            logger.info(f"Uploaded {filename} to Azure Blob Storage container '{self.azure_container_name}'")
             
         except Exception as e:
-            logger.error(f"Error uploading to Azure Storage: {e}")
+            logger.error(f"Error uploading {filename} to Azure Storage: {e}")
+    
+    def _get_filings_container_client(self):
+        """Container client for the environment-configured filings mirror, created once."""
+        with self._filings_container_lock:
+            if self._filings_container_client is None:
+                print("Azure Storage connection string found, initializing client...")
+                container_client = BlobServiceClient.from_connection_string(
+                    self.azure_storage_connection
+                ).get_container_client(_FILINGS_CONTAINER)
+                try:
+                    print('Creating container if not exists...')
+                    container_client.create_container()
+                except Exception:
+                    pass  # Container may already exist
+                self._filings_container_client = container_client
+            return self._filings_container_client
+    
+    def _mirror_to_filings_container(self, file_path: str, source_url: Optional[str] = None):
+        """Upload a saved filing to the environment-configured filings container."""
+        blob_name = os.path.basename(file_path)
+        try:
+            container_client = self._get_filings_container_client()
+            if not self._copy_from_source(container_client.get_blob_client(blob_name), source_url):
+                with open(file_path, "rb") as data:
+                    container_client.upload_blob(name=blob_name, data=data, overwrite=True)
+            logger.info(f"Uploaded {blob_name} to Azure Blob Storage container '{_FILINGS_CONTAINER}'")
+        except Exception as e:
+            logger.error(f"Error uploading {blob_name} to Azure Storage: {e}")
+    
+    def _queue_upload(self, file_path: str, source_url: Optional[str] = None):
+        """Hand a saved filing's blob uploads to the background upload pool."""
+        if self.blob_service_client:
+            self._upload_futures.append(self._upload_pool.submit(
+                self._upload_to_azure_storage, os.path.basename(file_path), file_path, source_url
+            ))
+        if self.azure_storage_connection and AZURE_STORAGE_AVAILABLE:
+            self._upload_futures.append(self._upload_pool.submit(
+                self._mirror_to_filings_container, file_path, source_url
+            ))
+    
+    def wait_for_uploads(self):
+        """Block until every queued blob upload has finished."""
+        futures, self._upload_futures = self._upload_futures, []
+        wait(futures)
+    
+    def close(self):
+        """Finish pending uploads and release the upload pool and HTTP session."""
+        self.wait_for_uploads()
+        self._upload_pool.shutdown()
+        self.session.close()
     
     def scrape_company_10k_filings(self, company_symbol: str, years: List[int], 
-                                 output_dir: str) -> List[str]:
+                                 output_dir: str) -> List[Tuple[str, int]]:
         """
         Scrape all 10-K filings for a company and specified years.
         
@@ -362,7 +716,7 @@ class SECEdgarScraper:
             output_dir: Output directory for files
             
         Returns:
-            List of successfully downloaded file paths
+            List of (file path, size in bytes) for each downloaded filing
         """
         logger.info(f"Starting 10-K download for {company_symbol}, years: {years}")
         
@@ -383,31 +737,20 @@ class SECEdgarScraper:
         for filing in target_filings:
             logger.info(f"Downloading {company_symbol} 10-K for {filing['year']}...")
             
-            file_path = self.download_filing(company_symbol, filing, output_dir)
-            if file_path:
-                downloaded_files.append(file_path)
-                # Upload to Azure Blob Storage if configured
-                if self.blob_service_client:
-                    try:
-                        blob_name = os.path.basename(file_path)
-                        with open(file_path, "rb") as data:
-                            self.blob_service_client.get_blob_client(
-                                container=self.azure_container_name,
-                                blob=blob_name
-                            ).upload_blob(data, overwrite=True, content_type='text/html')
-                        logger.info(f"Uploaded {blob_name} to Azure Blob Storage container '{self.azure_container_name}'")
-                    except Exception as e:
-                        logger.error(f"Error uploading {blob_name} to Azure Storage: {e}")
-            # Delay between downloads
-            time.sleep(1)
+            downloaded = self.download_filing(company_symbol, filing, output_dir)
+            if downloaded:
+                downloaded_files.append(downloaded)
         
         logger.info(f"Completed download for {company_symbol}: {len(downloaded_files)} files")
         return downloaded_files
     
     def scrape_all_companies(self, companies: List[str], years: List[int], 
-                           output_dir: str) -> Dict[str, List[str]]:
+                           output_dir: str) -> Dict[str, List[Tuple[str, int]]]:
         """
-        Scrape 10-K filings for multiple companies.
+        Scrape 10-K filings for multiple companies concurrently.
+        
+        Each company runs on its own worker thread; the shared token bucket
+        keeps the combined request rate within SEC's limit.
         
         Args:
             companies: List of company symbols
@@ -415,23 +758,258 @@ class SECEdgarScraper:
             output_dir: Output directory
             
         Returns:
-            Dictionary mapping company symbols to downloaded file paths
+            Dictionary mapping company symbols to (file path, size in bytes) lists
+        """
+        all_results = {company: [] for company in companies}
+        if not companies:
+            return all_results
+        
+        try:
+            with ThreadPoolExecutor(max_workers=min(_MAX_COMPANY_WORKERS, len(companies))) as executor:
+                futures = {
+                    executor.submit(self.scrape_company_10k_filings, company, years, output_dir): company
+                    for company in all_results
+                }
+                for future in as_completed(futures):
+                    all_results[futures[future]] = future.result()
+        finally:
+            self.wait_for_uploads()
+        
+        return all_results
+
+    
+    async def _make_request_async(self, client: "httpx.AsyncClient", url: str,
+                                  limiter: "AsyncLimiter", semaphore: asyncio.Semaphore,
+                                  retries: int = 3, max_age: float = 0,
+                                  stream: bool = False) -> Optional["httpx.Response"]:
+        """
+        Make a request to SEC under a shared rate limit with retry logic.
+        
+        Args:
+            client: Shared async HTTP client
+            url: The URL to request
+            limiter: Token bucket shared by all concurrent scrapes
+            semaphore: Caps in-flight requests across all concurrent scrapes
+            retries: Number of retry attempts
+            max_age: Seconds a cached response is served without revalidation
+            stream: Leave the body unread for aiter_bytes (caller must aclose);
+                bypasses the HTTP cache
+            
+        Returns:
+            Response object or None if failed
+        """
+        use_cache = self._http_cache is not None and not stream
+        cached = await asyncio.to_thread(self._http_cache.get, url) if use_cache else None
+        if cached and _is_fresh(url, cached[3], max_age):
+            return httpx.Response(200, content=cached[2], request=httpx.Request('GET', url))
+        headers = _revalidation_headers(cached)
+        
+        delay = _RETRY_BASE_DELAY
+        for attempt in range(retries):
+            try:
+                async with semaphore:
+                    async with limiter:
+                        response = await client.send(
+                            client.build_request('GET', url, headers=headers), stream=stream
+                        )
+                if response.status_code == 304 and cached:
+                    await asyncio.to_thread(self._http_cache.touch, url)
+                    return httpx.Response(200, content=cached[2], request=response.request)
+                try:
+                    response.raise_for_status()
+                except httpx.HTTPStatusError:
+                    await response.aclose()
+                    raise
+                if use_cache:
+                    await asyncio.to_thread(self._http_cache.put, url, response)
+                return response
+            except httpx.HTTPError as e:
+                logger.warning(f"Request attempt {attempt + 1} failed for {url}: {e}")
+                if attempt < retries - 1:
+                    delay = _retry_delay(delay, getattr(e, 'response', None))
+                    await asyncio.sleep(delay)
+                else:
+                    logger.error(f"All retry attempts failed for {url}")
+                    return None
+    
+    async def download_filing_async(self, client: "httpx.AsyncClient", company_symbol: str,
+                                    filing: Dict, output_dir: str, limiter: "AsyncLimiter",
+                                    semaphore: asyncio.Semaphore) -> Optional[Tuple[str, int]]:
+        """
+        Download a specific 10-K filing without blocking the event loop.
+        
+        A copy saved by an earlier run is reused without any request.
+        
+        Args:
+            client: Shared async HTTP client
+            company_symbol: Company symbol
+            filing: Filing information dictionary
+            output_dir: Output directory for local storage
+            limiter: Shared request rate limiter
+            semaphore: Shared in-flight request cap
+            
+        Returns:
+            (local file path, size in bytes) if successful, None otherwise
+        """
+        existing = self._existing_filing(company_symbol, filing, output_dir)
+        if existing:
+            return existing
+        
+        cik = self.companies[company_symbol]['cik']
+        accession_number = filing['accession_number']
+        base_url = f"https://www.sec.gov/Archives/edgar/data/{cik}/{accession_number.replace('-', '')}"
+        document_link = filing.get('primary_document')
+        if document_link:
+            logger.info(f"Downloading 10-K filing for {company_symbol} {filing['year']} ({document_link})")
+        else:
+            index_url = f"{base_url}/index.json"
+            logger.info(f"Downloading 10-K filing for {company_symbol} {filing['year']} (index: {index_url})")
+            response = await self._make_request_async(client, index_url, limiter, semaphore)
+            if not response:
+                logger.error(f"Failed to fetch filing index: {index_url}")
+                return None
+            try:
+                index_data = response.json()
+            except ValueError as e:
+                logger.error(f"Failed to parse filing index {index_url}: {e}")
+                return None
+            document_link = self._find_document_link(index_data, filing)
+        document_url = f"{base_url}/{document_link}"
+        
+        doc_response = await self._make_request_async(
+            client, document_url, limiter, semaphore, stream=True
+        )
+        if not doc_response:
+            logger.error(f"Failed to download document: {document_url}")
+            return None
+        
+        # The body streams into a file written off the event loop; blob uploads go to the background pool
+        try:
+            downloaded = await asyncio.to_thread(
+                self._save_filing, company_symbol, filing,
+                _iter_from_thread(doc_response.aiter_bytes(_DOWNLOAD_CHUNK_SIZE), asyncio.get_running_loop()),
+                output_dir
+            )
+        finally:
+            await doc_response.aclose()
+        if downloaded:
+            self._queue_upload(downloaded[0], document_url)
+        return downloaded
+    
+    async def _find_10k_filings_async(self, client: "httpx.AsyncClient", company_symbol: str,
+                                      years: List[int], limiter: "AsyncLimiter",
+                                      semaphore: asyncio.Semaphore) -> List[Dict]:
+        """Fetch a company's submissions and return its 10-K filings for the given years."""
+        if company_symbol not in self.companies:
+            logger.error(f"Unknown company symbol: {company_symbol}")
+            return []
+        
+        cik = self.companies[company_symbol]['cik']
+        url = f"https://data.sec.gov/submissions/CIK{cik.zfill(10)}.json"
+        response = await self._make_request_async(
+            client, url, limiter, semaphore, max_age=_SUBMISSIONS_MAX_AGE
+        )
+        if not response:
+            logger.error(f"Could not retrieve filing data for {company_symbol}")
+            return []
+        try:
+            filings_data = response.json()
+        except json.JSONDecodeError as e:
+            logger.error(f"Failed to parse JSON response for {company_symbol}: {e}")
+            return []
+        
+        target_filings = self.find_10k_filings(filings_data, years)
+        if not target_filings:
+            logger.warning(f"No 10-K filings found for {company_symbol} in years {years}")
+        return target_filings
+    
+    async def scrape_company_10k_filings_async(self, client: "httpx.AsyncClient",
+                                               company_symbol: str, years: List[int],
+                                               output_dir: str, limiter: "AsyncLimiter",
+                                               semaphore: asyncio.Semaphore) -> List[Tuple[str, int]]:
         """
-        all_results = {}
+        Async variant of scrape_company_10k_filings sharing a client and rate limit.
         
-        for company in companies:
-            logger.info(f"\n{'='*50}")
-            logger.info(f"Processing {company}")
-            logger.info(f"{'='*50}")
+        Args:
+            client: Shared async HTTP client
+            company_symbol: Company symbol (e.g., 'GOOGL')
+            years: List of years to download
+            output_dir: Output directory for files
+            limiter: Shared request rate limiter
+            semaphore: Shared in-flight request cap
             
-            files = self.scrape_company_10k_filings(company, years, output_dir)
-            all_results[company] = files
+        Returns:
+            List of (file path, size in bytes) for each downloaded filing
+        """
+        logger.info(f"Starting 10-K download for {company_symbol}, years: {years}")
+        
+        target_filings = await self._find_10k_filings_async(
+            client, company_symbol, years, limiter, semaphore
+        )
+        
+        # The shared limiter paces requests, so filings download concurrently
+        results = await asyncio.gather(*[
+            self.download_filing_async(client, company_symbol, filing, output_dir, limiter, semaphore)
+            for filing in target_filings
+        ])
+        downloaded_files = [result for result in results if result]
+        
+        logger.info(f"Completed download for {company_symbol}: {len(downloaded_files)} files")
+        return downloaded_files
+    
+    async def scrape_all_companies_async(self, companies: List[str], years: List[int],
+                                         output_dir: str) -> Dict[str, List[Tuple[str, int]]]:
+        """
+        Scrape 10-K filings for multiple companies concurrently.
+        
+        Submissions are fetched for every company at once, then every
+        (company, filing) download is issued in a single flat gather. All
+        requests share one HTTP/2 client, semaphore and token bucket, so the
+        combined request rate stays within SEC's 10 requests per second.
+        
+        Args:
+            companies: List of company symbols
+            years: List of years to download
+            output_dir: Output directory
             
-            # Delay between companies
-            if company != companies[-1]:  # Don't delay after the last company
-                logger.info("Waiting 2 seconds before next company...")
-                time.sleep(2)
+        Returns:
+            Dictionary mapping company symbols to (file path, size in bytes) lists
+        """
+        if not ASYNC_SCRAPER_AVAILABLE:
+            raise RuntimeError("Async scraping requires httpx and aiolimiter")
+        
+        semaphore = asyncio.Semaphore(SEC_MAX_REQUESTS_PER_SECOND)
+        limiter = AsyncLimiter(SEC_MAX_REQUESTS_PER_SECOND, 1)
+        async with httpx.AsyncClient(
+            headers=self.headers,
+            http2=HTTP2_AVAILABLE,
+            limits=httpx.Limits(
+                max_keepalive_connections=SEC_MAX_REQUESTS_PER_SECOND,
+                max_connections=SEC_MAX_REQUESTS_PER_SECOND
+            ),
+            timeout=12,
+        ) as client:
+            company_filings = await asyncio.gather(*[
+                self._find_10k_filings_async(client, company, years, limiter, semaphore)
+                for company in companies
+            ])
+            jobs = [
+                (company, filing)
+                for company, filings in zip(companies, company_filings)
+                for filing in filings
+            ]
+            downloads = await asyncio.gather(*[
+                self.download_filing_async(client, company, filing, output_dir, limiter, semaphore)
+                for company, filing in jobs
+            ])
+        await asyncio.to_thread(self.wait_for_uploads)
         
+        all_results = {company: [] for company in companies}
+        for (company, _), downloaded in zip(jobs, downloads):
+            if downloaded:
+                all_results[company].append(downloaded)
+        for company, files in all_results.items():
+            logger.info(f"Completed download for {company}: {len(files)} files")
         return all_results
 
 
@@ -508,8 +1086,6 @@ def create_demo_filings(output_dir: str = "demo_filings"):
         }
     }
     
-    created_files = []
-    
     load_dotenv()
     connection_string = os.getenv("AZURE_STORAGE_CONNECTION_STRING")
     container_name = "filings"
@@ -525,26 +1101,35 @@ def create_demo_filings(output_dir: str = "demo_filings"):
         except Exception:
             pass  # Container may already exist
     
-    for company, company_info in demo_data.items():
-        for year, financials in company_info['years'].items():
-            content = demo_content_template.format(
+    demo_filings = [
+        (
+            os.path.join(output_dir, f"{company}_10K_{year}_demo.htm"),
+            demo_content_template.format(
                 company=company,
                 company_name=company_info['name'],
                 year=year,
                 **financials
             )
-            filename = f"{company}_10K_{year}_demo.htm"
-            file_path = os.path.join(output_dir, filename)
-            with open(file_path, 'w', encoding='utf-8') as f:
-                f.write(content)
-            created_files.append(file_path)
-            logger.info(f"Created demo filing: {filename}")
-            # Upload to Azure Blob Storage if configured
-            if container_client:
-                blob_name = os.path.basename(file_path)
-                with open(file_path, "rb") as data:
-                    container_client.upload_blob(name=blob_name, data=data, overwrite=True)
-                print(f"Uploaded {filename} to Azure Blob Storage container '{container_name}'")
+        )
+        for company, company_info in demo_data.items()
+        for year, financials in company_info['years'].items()
+    ]
+    
+    def write_filing(demo_filing: Tuple[str, str]) -> str:
+        file_path, content = demo_filing
+        filename = os.path.basename(file_path)
+        with open(file_path, 'w', encoding='utf-8') as f:
+            f.write(content)
+        logger.info(f"Created demo filing: {filename}")
+        # Upload to Azure Blob Storage if configured, straight from memory
+        if container_client:
+            container_client.upload_blob(name=filename, data=content.encode('utf-8'), overwrite=True)
+            logger.info(f"Uploaded {filename} to Azure Blob Storage container '{container_name}'")
+        return file_path
+    
+    # Writes and uploads are independent, so run them side by side
+    with ThreadPoolExecutor(max_workers=_DEMO_FILING_WORKERS) as executor:
+        created_files = list(executor.map(write_filing, demo_filings))
     
     print(f"Created {len(created_files)} demo filings in {output_dir}")
     return created_files
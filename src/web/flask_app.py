@@ -152,11 +152,11 @@ def api_search():
         if not query_text:
             return jsonify({'error': 'Query text is required'}), 400
         
-        # Get query embedding
-        query_embedding = rag_pipeline.embedding_service.get_embedding(query_text)
+        # Get query embedding (cached for repeated queries)
+        query_embedding = rag_pipeline.embedding_service.get_query_embedding(query_text)
         
         # Search Azure AI Search
-        search_results = rag_pipeline.search_manager.search(query_embedding, top_k)
+        search_results = rag_pipeline.search_manager.search(query_embedding, top_k, query_text=query_text)
         
         return jsonify({
             'query': query_text,
@@ -279,7 +279,10 @@ def api_admin_add_years():
         logger.info(f"Starting scraping for companies: {companies}, years: {years}")
         
         # Scrape new filings
-        scrape_results = scraper.scrape_all_companies(companies, years, output_dir)
+        scrape_results = {
+            company: [file_path for file_path, _ in files]
+            for company, files in scraper.scrape_all_companies(companies, years, output_dir).items()
+        }
         
         # Count successfully downloaded files
         total_files = sum(len(files) for files in scrape_results.values())
@@ -308,6 +311,7 @@ def api_admin_add_years():
             'scrape_results': scrape_results,
             'processed_files': processing_results.get('processed_files', 0),
             'total_chunks': processing_results.get('total_chunks', 0),
+            'failed_chunks': processing_results.get('failed_chunks', 0),
             'search_documents': processing_results.get('search_documents', 0),
             'timestamp': datetime.now().isoformat()
         })
@@ -424,7 +428,10 @@ def api_admin_trigger_scraper():
         os.makedirs(output_dir, exist_ok=True)
         
         # Scrape documents
-        scrape_results = scraper.scrape_all_companies(companies, years, output_dir)
+        scrape_results = {
+            company: [file_path for file_path, _ in files]
+            for company, files in scraper.scrape_all_companies(companies, years, output_dir).items()
+        }
         
         # Count total files scraped
         total_files = sum(len(files) for files in scrape_results.values())
@@ -520,6 +527,7 @@ def api_admin_create_embeddings():
             'message': f'Successfully created embeddings for {len(downloaded_files)} files',
             'processed_files': processing_results.get('processed_files', 0),
             'total_chunks': processing_results.get('total_chunks', 0),
+            'failed_chunks': processing_results.get('failed_chunks', 0),
             'search_documents': processing_results.get('search_documents', 0),
             'selected_files': selected_files,
             'timestamp': datetime.now().isoformat()
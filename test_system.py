@@ -187,10 +187,10 @@ def test_mock_rag_pipeline():
                     'id': chunk['id'],
                     'content': chunk['text'],
                     'vector': embedding,
-                    'company': chunk['metadata'].get('company'),
-                    'year': chunk['metadata'].get('year'),
-                    'filing_type': chunk['metadata'].get('filing_type'),
-                    'chunk_id': chunk['metadata'].get('chunk_id'),
+                    'company': chunk.get('company'),
+                    'year': chunk.get('year'),
+                    'filing_type': chunk.get('filing_type'),
+                    'chunk_id': chunk.get('chunk_id'),
                 }
                 documents.append(document)
             
@@ -257,6 +257,195 @@ def test_scraper():
         return False
 
 
+def test_chunk_packing():
+    """Test that both chunkers pack text within the token limit without losing any."""
+    logger.info("Testing chunk packing...")
+    
+    try:
+        from rag.azure_rag_pipeline import DocumentProcessor
+        
+        processor = DocumentProcessor(chunk_size=50)
+        paragraphs = [f"Paragraph {i} reports revenue of ${i * 10} million. " * (i % 4 + 1) for i in range(30)]
+        # One paragraph larger than the limit is packed sentence by sentence
+        paragraphs.append("Operating income grew in every segment this year. " * 12)
+        text = "SECTION_1: Item 1. Business\n" + "\n\n".join(paragraph.strip() for paragraph in paragraphs)
+        metadata = {'company': 'TEST', 'year': '2023'}
+        
+        # Structured chunker: no chunk over the limit, paragraphs kept in order
+        chunks = processor.chunk_text(text, metadata)
+        assert len(chunks) > 1
+        assert all(chunk['token_count'] <= 50 for chunk in chunks)
+        assert " ".join(chunk['text'] for chunk in chunks).split() == text.split()[4:]
+        
+        # ChunkBatch indexing: sequential ids, contiguous token ranges, shared file metadata
+        for i, chunk in enumerate(chunks):
+            assert chunk['chunk_id'] == i
+            assert chunk['company'] == 'TEST' and chunk['section_title'] == 'Item 1. Business'
+            if i:
+                assert chunk['start_token'] == chunks[i - 1]['end_token']
+        assert len({chunk['id'] for chunk in chunks}) == len(chunks)
+        
+        # Regex chunker: pieces rejoin to the exact text and no chunk exceeds the limit
+        regex_chunks = processor.chunk_text_regex(text, metadata)
+        assert "".join(regex_chunks.texts) == text
+        assert all(count <= 50 for count in regex_chunks.token_counts)
+        
+        logger.info(f"Packed into {len(chunks)} structured and {len(regex_chunks)} regex chunks")
+        return True
+    
+    except Exception as e:
+        logger.error(f"Chunk packing test failed: {e!r}")
+        return False
+
+
+def test_filing_selection():
+    """Test 10-K selection from submissions JSON and document lookup in a filing index."""
+    logger.info("Testing filing selection...")
+    
+    try:
+        from scrapers.sec_edgar_scraper import SECEdgarScraper
+        
+        scraper = SECEdgarScraper(http_cache_path=None)
+        try:
+            filings_data = {'filings': {'recent': {
+                'form': ['10-K', '8-K', '10-Q', '10-K/A', '10-K', '10-K'],
+                'filingDate': ['2024-02-01', '2023-11-01', '2023-08-01', '2023-04-01', '2023-02-01', '2021-02-01'],
+                'accessionNumber': ['0001-24-1', '0001-23-4', '0001-23-3', '0001-23-2', '0001-23-1', '0001-21-1'],
+                # Shorter than the other columns, as in some older submissions files
+                'primaryDocument': ['a10k2024.htm', 'x.htm', 'q.htm', 'a.htm', 'a10k2023.htm']
+            }}}
+            filings = scraper.find_10k_filings(filings_data, [2021, 2023, 2024])
+            assert [filing['accession_number'] for filing in filings] == ['0001-21-1', '0001-23-1', '0001-24-1']
+            assert [filing['year'] for filing in filings] == [2021, 2023, 2024]
+            assert [filing['primary_document'] for filing in filings] == [None, 'a10k2023.htm', 'a10k2024.htm']
+            assert scraper.find_10k_filings({}, [2023]) == []
+            
+            filing = {'accession_number': '0001-23-1'}
+            index_data = {'directory': {'item': [
+                {'name': 'R1.htm', 'size': '99999'},
+                {'name': 'ex21.htm', 'size': '500'},
+                {'name': 'goog-10k_2023.htm', 'size': '900'},
+                {'name': 'goog-20231231.htm', 'size': '123456'},
+                {'name': 'Financial_Report.xlsx', 'size': '999999'}
+            ]}}
+            # A name containing "10-k" wins; otherwise the largest non-R .htm document
+            assert scraper._find_document_link(
+                {'directory': {'item': index_data['directory']['item'] + [{'name': 'goog-10-K.htm', 'size': '1'}]}},
+                filing
+            ) == 'goog-10-K.htm'
+            assert scraper._find_document_link(index_data, filing) == 'goog-20231231.htm'
+            assert scraper._find_document_link({'directory': {'item': []}}, filing) == '0001-23-1.txt'
+        finally:
+            scraper.close()
+        
+        logger.info(f"Selected {len(filings)} filings")
+        return True
+    
+    except Exception as e:
+        logger.error(f"Filing selection test failed: {e!r}")
+        return False
+
+
+def test_request_pacing():
+    """Test retry backoff bounds and token bucket pacing against a fake clock."""
+    logger.info("Testing request pacing...")
+    
+    try:
+        import random
+        from types import SimpleNamespace
+        from scrapers import sec_edgar_scraper
+        from scrapers.sec_edgar_scraper import _retry_delay, _TokenBucket
+        
+        # Retry-After is honored on 429/503 and capped; other failures use jitter
+        throttled = SimpleNamespace(status_code=429, headers={'Retry-After': '5'})
+        assert _retry_delay(1.0, throttled) == 5.0
+        assert _retry_delay(1.0, SimpleNamespace(status_code=503, headers={'Retry-After': '600'})) == 30.0
+        random.seed(0)
+        delay = 1.0
+        for _ in range(100):
+            previous = delay
+            delay = _retry_delay(previous, SimpleNamespace(status_code=500, headers={'Retry-After': '5'}))
+            assert 1.0 <= delay <= min(30.0, previous * 3)
+        
+        # A one-token bucket spaces back-to-back requests 1/rate apart
+        clock = SimpleNamespace(now=100.0, sleeps=[])
+        fake_time = SimpleNamespace(monotonic=lambda: clock.now, sleep=clock.sleeps.append)
+        real_time = sec_edgar_scraper.time
+        sec_edgar_scraper.time = fake_time
+        try:
+            bucket = _TokenBucket(rate=10, capacity=1)
+            for _ in range(3):
+                bucket.acquire()
+            # A quarter second refills 2.5 tokens against the three already reserved
+            clock.now += 0.25
+            bucket.acquire()
+        finally:
+            sec_edgar_scraper.time = real_time
+        assert [round(wait, 6) for wait in clock.sleeps] == [0.1, 0.2, 0.05]
+        
+        return True
+    
+    except Exception as e:
+        logger.error(f"Request pacing test failed: {e!r}")
+        return False
+
+
+def test_http_cache_revalidation():
+    """Test that cached responses are revalidated with their ETag and served on 304."""
+    logger.info("Testing HTTP cache revalidation...")
+    
+    try:
+        import io
+        import tempfile
+        import requests
+        from requests.adapters import BaseAdapter
+        from scrapers.sec_edgar_scraper import SECEdgarScraper
+        
+        sent = []
+        
+        class MockSECAdapter(BaseAdapter):
+            """Serves one versioned JSON body and answers 304 to a matching If-None-Match."""
+            
+            def send(self, request, stream=False, **kwargs):
+                sent.append(request.headers.get('If-None-Match'))
+                response = requests.Response()
+                response.url = request.url
+                response.request = request
+                response.headers['ETag'] = '"v1"'
+                if request.headers.get('If-None-Match') == '"v1"':
+                    response.status_code = 304
+                    response.raw = io.BytesIO(b'')
+                else:
+                    response.status_code = 200
+                    response.raw = io.BytesIO(b'{"version": 1}')
+                return response
+            
+            def close(self):
+                pass
+        
+        with tempfile.TemporaryDirectory() as cache_dir:
+            scraper = SECEdgarScraper(http_cache_path=os.path.join(cache_dir, "cache.db"))
+            try:
+                scraper.session.mount("https://", MockSECAdapter())
+                url = "https://data.sec.gov/submissions/CIK0000000001.json"
+                
+                assert scraper._make_request(url).json() == {'version': 1}
+                # Stale entry: revalidated, and the 304 is answered from the cache
+                assert scraper._make_request(url).json() == {'version': 1}
+                assert sent == [None, '"v1"']
+                # Fresh entry: served without a request
+                assert scraper._make_request(url, max_age=60).json() == {'version': 1}
+                assert len(sent) == 2
+            finally:
+                scraper.close()
+        
+        return True
+    
+    except Exception as e:
+        logger.error(f"HTTP cache revalidation test failed: {e!r}")
+        return False
+
+
 def main():
     """Run all tests."""
     logger.info("Starting Azure RAG Financial System Tests")
@@ -275,6 +464,10 @@ def main():
     tests = [
         ("Document Processing", test_document_processing),
         ("SEC Scraper", test_scraper),
+        ("Chunk Packing", test_chunk_packing),
+        ("Filing Selection", test_filing_selection),
+        ("Request Pacing", test_request_pacing),
+        ("HTTP Cache Revalidation", test_http_cache_revalidation),
         ("Mock RAG Pipeline", test_mock_rag_pipeline),
     ]
     